@@ -21,9 +21,14 @@ if config.config_file_name is not None:
 from src.models.base import Base
 # Import all models to ensure they're registered with Base.metadata
 # These imports are intentionally not used directly - they register the models with SQLAlchemy
-from src.models.user import UserModel, SubscriptionModel  # noqa: F401
+from src.models.user import UserModel  # noqa: F401
+from src.models.subscription import SubscriptionModel  # noqa: F401
 from src.models.account import MonitoredAccountModel  # noqa: F401
 from src.models.video import ProcessedVideoModel  # noqa: F401
+from src.models.outbox import EventOutboxModel  # noqa: F401
+from src.models.processed_event import ProcessedEventModel  # noqa: F401
+from src.models.notification_delivery import NotificationDeliveryModel  # noqa: F401
+from src.models.pending_notification import PendingNotificationModel  # noqa: F401
 
 target_metadata = Base.metadata
 
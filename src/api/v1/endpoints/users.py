@@ -1,10 +1,14 @@
 """
 Users API endpoints.
-Placeholder for future user management operations.
+User listing and subscription management.
 """
+import uuid
 from src.services.user import user_service
+from src.services.subscription_service import SubscriptionService
+from src.core.dependencies import get_subscription_service
 from src.schemas.user import UserParams
-from fastapi import APIRouter, Depends
+from src.schemas.subscription import SubscriptionCreate, SubscriptionRead
+from fastapi import APIRouter, Depends, HTTPException, status
 
 router = APIRouter()
 
@@ -19,4 +23,26 @@ router = APIRouter()
 
 @router.get("/")
 async def get_users(params: UserParams = Depends(UserParams)):
-    return await user_service.get_all_users(params)
\ No newline at end of file
+    return await user_service.get_all_users(params)
+
+
+@router.post("/{user_id}/subscriptions", response_model=SubscriptionRead)
+async def subscribe(
+    user_id: uuid.UUID,
+    body: SubscriptionCreate,
+    service: SubscriptionService = Depends(get_subscription_service),
+):
+    subscription = await service.subscribe(user_id, body.username, body.keywords)
+    if subscription is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User or account not found")
+    return subscription
+
+
+@router.delete("/{user_id}/subscriptions/{username}", status_code=status.HTTP_204_NO_CONTENT)
+async def unsubscribe(
+    user_id: uuid.UUID,
+    username: str,
+    service: SubscriptionService = Depends(get_subscription_service),
+):
+    if not await service.unsubscribe(user_id, username):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
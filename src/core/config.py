@@ -16,7 +16,162 @@ class Settings(BaseSettings):
     
     # Kafka
     KAFKA_BROKER_URL: str = "localhost:9092"
-    
+
+    # Kafka producer batching
+    KAFKA_PRODUCER_LINGER_MS: int = 5
+    KAFKA_PRODUCER_MAX_BATCH_SIZE: int = 65536
+    # One of "gzip", "lz4", "zstd" (lz4/zstd need aiokafka[lz4] / aiokafka[zstd])
+    KAFKA_PRODUCER_COMPRESSION: str | None = None
+    # Max events awaiting a broker ack before send_event_nowait() blocks
+    KAFKA_PRODUCER_MAX_IN_FLIGHT: int = 1000
+    # Kafka consumer prefetch limits; video.found events are ~0.5 KB, so the
+    # per-partition fetch holds a few hundred events (a few watermarks' worth)
+    KAFKA_CONSUMER_FETCH_MAX_BYTES: int = 4 * 1024 * 1024
+    KAFKA_CONSUMER_MAX_PARTITION_FETCH_BYTES: int = 256 * 1024
+    # Topics whose metadata the API producer fetches at startup
+    KAFKA_WARMUP_TOPICS: str = "video.found.fast,video.found.bulk"
+    # Hot accounts pinned to dedicated partitions, e.g. "big_creator:0,other:1".
+    # Other keys are hashed over the remaining partitions.
+    KAFKA_PINNED_KEYS: str = ""
+    # Wire codec for published events: "json" or "orjson". JSON is the
+    # default: orjson is only marginally faster since pydantic-core already
+    # serializes natively (see src/test/bench_codecs.py)
+    EVENT_CODEC: str = "json"
+
+    # Outbox relay
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # Tracker scheduler: accounts polled at once (0 = as many as the video
+    # fetcher can serve, i.e. TIKTOK_SESSIONS) and videos fetched per poll.
+    # An account is polled every TRACKER_INTERVAL_FACTOR x its smoothed gap
+    # between videos (or x its current silence, once that is longer),
+    # clamped to [MIN, MAX]; accounts without history use the DEFAULT
+    TRACKER_CONCURRENCY: int = 0
+    TRACKER_VIDEOS_PER_POLL: int = 10
+    TRACKER_MIN_INTERVAL_SECONDS: float = 120.0
+    TRACKER_DEFAULT_INTERVAL_SECONDS: float = 900.0
+    TRACKER_MAX_INTERVAL_SECONDS: float = 6 * 3600.0
+    TRACKER_INTERVAL_FACTOR: float = 0.1
+    # Weight of the newest gap in the smoothed gap between videos
+    TRACKER_INTERVAL_SMOOTHING: float = 0.3
+    # Tracker replicas lease due accounts for TRACKER_LEASE_SECONDS (a failed
+    # or crashed poll is retried once it expires) and check the DB for due
+    # accounts at least every TRACKER_IDLE_CHECK_SECONDS
+    TRACKER_LEASE_SECONDS: float = 300.0
+    TRACKER_IDLE_CHECK_SECONDS: float = 10.0
+    # Per-tracker Bloom filter of processed video IDs: initial capacity and
+    # target false-positive rate (it grows as needed), snapshot file and
+    # interval ("" disables snapshots) and rows per chunk when seeding it
+    TRACKER_BLOOM_CAPACITY: int = 1_000_000
+    TRACKER_BLOOM_ERROR_RATE: float = 0.01
+    TRACKER_BLOOM_SNAPSHOT_PATH: str = ".cache/processed_videos.bloom"
+    TRACKER_BLOOM_SNAPSHOT_INTERVAL_SECONDS: float = 300.0
+    TRACKER_BLOOM_SEED_CHUNK_SIZE: int = 10_000
+    # Where the tracker scrapes from: "tiktok", or "fake" for synthetic
+    # accounts (local runs / load tests) answering after FAKE_TIKTOK_LATENCY
+    TRACKER_FETCHER: str = "tiktok"
+    FAKE_TIKTOK_LATENCY_SECONDS: float = 0.2
+    # TikTokApi session pool: warm browser sessions per tracker (this bounds
+    # concurrent scrapes), fetches before a session is recycled, max wait
+    # for a free one, and optional msToken cookie
+    TIKTOK_SESSIONS: int = 5
+    TIKTOK_SESSION_MAX_USES: int = 500
+    TIKTOK_ACQUIRE_TIMEOUT_SECONDS: float = 30.0
+    TIKTOK_MS_TOKEN: str | None = None
+
+    # Notifier worker
+    # "stream" handles events one by one, "concurrent" runs several per
+    # partition with ordered manual commits, "batch" uses getmany() batches
+    WORKER_MODE: str = "stream"
+    # concurrent mode: events per partition (ordered per account)
+    WORKER_CONCURRENCY: int = 8
+    # concurrent mode flow control: pause fetching above the high watermark
+    # (events or payload bytes), resume at the low watermark
+    WORKER_MAX_IN_FLIGHT: int = 64
+    WORKER_LOW_WATERMARK: int = 32
+    WORKER_MAX_IN_FLIGHT_BYTES: int = 8 * 1024 * 1024
+    # batch mode: max events per batch / max wait for a batch to fill
+    WORKER_BATCH_SIZE: int = 500
+    WORKER_BATCH_TIMEOUT_MS: int = 1000
+
+    # Priority lanes: events of accounts with at least LANE_BULK_MIN_SUBSCRIBERS
+    # subscribers are published to video.found.bulk, all others to
+    # video.found.fast. Publishers cache counts for LANE_COUNT_TTL_SECONDS
+    LANE_BULK_MIN_SUBSCRIBERS: int = 5_000
+    LANE_COUNT_CACHE_SIZE: int = 100_000
+    LANE_COUNT_TTL_SECONDS: float = 600.0
+    # Lanes a worker consumes, each with its own consumer group and retry
+    # tiers, and per-lane concurrent-mode events per partition (lanes not
+    # listed use WORKER_CONCURRENCY)
+    WORKER_LANES: str = "fast,bulk"
+    WORKER_LANE_CONCURRENCY: str = "fast:16,bulk:2"
+
+    # Supervisor: worker processes (0 = one per CPU), restart backoff,
+    # grace period for draining on SIGTERM, throughput report interval
+    WORKER_PROCESSES: int = 0
+    WORKER_RESTART_BACKOFF_SECONDS: float = 1.0
+    WORKER_RESTART_BACKOFF_MAX_SECONDS: float = 60.0
+    WORKER_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0
+    WORKER_REPORT_INTERVAL_SECONDS: float = 10.0
+
+    # Idempotent consumer: in-process cache of recently handled event IDs,
+    # and how long a claim of a worker that never finished blocks others
+    IDEMPOTENCY_CACHE_SIZE: int = 100_000
+    IDEMPOTENCY_CACHE_TTL_SECONDS: float = 3600.0
+    IDEMPOTENCY_CLAIM_SECONDS: float = 900.0
+
+    # Notifier subscriber cache: max subscribers held across all accounts,
+    # and how long a list may be served without a subscription.changed event
+    SUBSCRIBER_CACHE_MAX_ENTRIES: int = 200_000
+    SUBSCRIBER_CACHE_TTL_SECONDS: float = 300.0
+
+    # Accounts with more subscribers than this are not loaded/cached whole:
+    # their (id, email) rows are streamed in chunks straight to delivery
+    SUBSCRIBER_STREAM_THRESHOLD: int = 5_000
+    SUBSCRIBER_STREAM_CHUNK_SIZE: int = 1_000
+
+    # Digests: buffer a user's notifications for up to DIGEST_WINDOW_SECONDS
+    # (or DIGEST_MAX_ITEMS videos) and send them as one email; 0 sends at once.
+    # Streamed fan-outs of very large accounts are always sent directly
+    DIGEST_WINDOW_SECONDS: float = 0.0
+    DIGEST_MAX_ITEMS: int = 10
+
+    # Email delivery: "console" prints, "smtp" sends through SMTP_HOST.
+    # EMAIL_CONCURRENCY sends run at once over up to SMTP_POOL_SIZE connections,
+    # each pipelining up to SMTP_PIPELINE_DEPTH messages per batch (keep
+    # concurrency >= pool size x depth to fill them); a failed recipient is
+    # retried with exponential backoff
+    EMAIL_BACKEND: str = "console"
+    EMAIL_FROM: str = "EventPulse <notifications@eventpulse.local>"
+    EMAIL_CONCURRENCY: int = 200
+    EMAIL_MAX_ATTEMPTS: int = 3
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 1.0
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    SMTP_USERNAME: str | None = None
+    SMTP_PASSWORD: str | None = None
+    SMTP_USE_TLS: bool = False
+    SMTP_START_TLS: bool = False
+    SMTP_POOL_SIZE: int = 20
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 1000
+    SMTP_PIPELINE_DEPTH: int = 10
+    # Outbound rate limits as token buckets: sends per second and burst size
+    # for the whole worker process, per recipient domain and per recipient
+    # address. A rate of 0 disables that limit. Limits are per process, so
+    # divide provider quotas by WORKER_PROCESSES
+    EMAIL_RATE_GLOBAL_PER_SECOND: float = 0.0
+    EMAIL_RATE_GLOBAL_BURST: int = 100
+    EMAIL_RATE_DOMAIN_PER_SECOND: float = 0.0
+    EMAIL_RATE_DOMAIN_BURST: int = 20
+    EMAIL_RATE_USER_PER_SECOND: float = 0.0
+    EMAIL_RATE_USER_BURST: int = 5
+
+    # Retry tiers (<topic>.retry.<delay>) tried in order before <topic>.dlq
+    RETRY_DELAYS: str = "10s,1m,10m"
+    RETRY_MAX_ATTEMPTS: int = 3
+
     # Application
     PROJECT_NAME: str = "EventPulse"
     
@@ -2,7 +2,7 @@
 Dependency Injection for FastAPI.
 Provides repository and service instances to API endpoints.
 """
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.db import get_db
 
@@ -11,10 +11,12 @@ from src.repositories.user import UserRepository
 from src.repositories.account import MonitoredAccountRepository
 from src.repositories.subscription import SubscriptionRepository
 from src.repositories.video import ProcessedVideoRepository
+from src.repositories.outbox import EventOutboxRepository
 
 # Services
 from src.services.notifier_service import NotifierService
 from src.services.tracker_service import TrackerService
+from src.services.subscription_service import SubscriptionService
 from src.core.kafka import EventProducer
 
 
@@ -40,6 +42,11 @@ async def get_processed_video_repo(db: AsyncSession = Depends(get_db)) -> Proces
     return ProcessedVideoRepository(db)
 
 
+async def get_outbox_repo(db: AsyncSession = Depends(get_db)) -> EventOutboxRepository:
+    """Provide EventOutboxRepository instance."""
+    return EventOutboxRepository(db)
+
+
 # --- Service Dependencies ---
 
 async def get_notifier_service(
@@ -49,15 +56,25 @@ async def get_notifier_service(
     return NotifierService(user_repo)
 
 
-async def get_event_producer() -> EventProducer:
-    """Provide EventProducer instance."""
-    return EventProducer()
+async def get_event_producer(request: Request) -> EventProducer:
+    """Provide the application-wide EventProducer started in the app lifespan."""
+    return request.app.state.event_producer
 
 
 async def get_tracker_service(
     account_repo: MonitoredAccountRepository = Depends(get_monitored_account_repo),
     video_repo: ProcessedVideoRepository = Depends(get_processed_video_repo),
-    producer: EventProducer = Depends(get_event_producer)
+    outbox_repo: EventOutboxRepository = Depends(get_outbox_repo),
+    subscription_repo: SubscriptionRepository = Depends(get_subscription_repo)
 ) -> TrackerService:
     """Provide TrackerService instance with injected dependencies."""
-    return TrackerService(account_repo, video_repo, producer)
+    return TrackerService(account_repo, video_repo, outbox_repo, subscription_repo)
+
+
+async def get_subscription_service(
+    subscription_repo: SubscriptionRepository = Depends(get_subscription_repo),
+    account_repo: MonitoredAccountRepository = Depends(get_monitored_account_repo),
+    outbox_repo: EventOutboxRepository = Depends(get_outbox_repo)
+) -> SubscriptionService:
+    """Provide SubscriptionService instance with injected dependencies."""
+    return SubscriptionService(subscription_repo, account_repo, outbox_repo)
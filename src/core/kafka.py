@@ -2,36 +2,223 @@
 Kafka producer and consumer wrapper classes.
 Provides event-driven communication infrastructure.
 """
-import json
 import asyncio
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+from aiokafka import AIOKafkaProducer, AIOKafkaConsumer, ConsumerRebalanceListener, TopicPartition
+from aiokafka.partitioner import DefaultPartitioner, murmur2
 from src.core.config import settings
+from src.core.ordering import KeyOrderedExecutor, OffsetTracker
+from src.schemas.events import BaseEvent
+
+
+def parse_pinned_keys(raw: str) -> dict[str, int]:
+    """Parse "key:partition,key:partition" into a dict."""
+    pinned = {}
+    for item in raw.replace(" ", "").split(","):
+        if item:
+            key, _, partition = item.rpartition(":")
+            pinned[key] = int(partition)
+    return pinned
+
+
+class PinnedKeyPartitioner:
+    """
+    Partitioner that gives hot keys a dedicated partition.
+
+    Pinned keys always go to their configured partition. Every other key is
+    murmur2-hashed (like the Java client) over the partitions that are not
+    reserved, so a hot account never shares its partition with anyone else.
+    Keyless messages fall back to the default random choice.
+    """
+    def __init__(self, pinned: dict[str, int] | None = None):
+        self.pinned = {key.encode("utf-8"): partition for key, partition in (pinned or {}).items()}
+        self.reserved = set(self.pinned.values())
+        self._default = DefaultPartitioner()
+
+    def __call__(self, key, all_partitions, available):
+        if key is None:
+            return self._default(key, all_partitions, available)
+
+        partition = self.pinned.get(key)
+        if partition is not None and partition in all_partitions:
+            return partition
+
+        candidates = [p for p in all_partitions if p not in self.reserved] or all_partitions
+        return candidates[(murmur2(key) & 0x7FFFFFFF) % len(candidates)]
 
 
 class EventProducer:
     """
     Kafka event producer for publishing domain events.
+
+    Records are batched by the underlying client (linger_ms / max_batch_size),
+    so callers that use send_event_nowait() or send_many() only pay the cost
+    of an enqueue. At most max_in_flight events may be waiting for a broker
+    ack; further sends wait until earlier ones are delivered (backpressure).
     """
-    def __init__(self):
+    COMPRESSION_TYPES = ("gzip", "lz4", "zstd")
+
+    def __init__(
+        self,
+        linger_ms: int | None = None,
+        max_batch_size: int | None = None,
+        compression_type: str | None = None,
+        max_in_flight: int | None = None,
+        codec: str | None = None,
+    ):
         self.bootstrap_servers = settings.KAFKA_BROKER_URL
+        self.linger_ms = settings.KAFKA_PRODUCER_LINGER_MS if linger_ms is None else linger_ms
+        self.max_batch_size = max_batch_size or settings.KAFKA_PRODUCER_MAX_BATCH_SIZE
+        self.compression_type = compression_type or settings.KAFKA_PRODUCER_COMPRESSION
+        self.max_in_flight = max_in_flight or settings.KAFKA_PRODUCER_MAX_IN_FLIGHT
+        self.codec = codec or settings.EVENT_CODEC
+
+        if self.compression_type and self.compression_type not in self.COMPRESSION_TYPES:
+            raise ValueError(
+                f"Unsupported compression '{self.compression_type}', "
+                f"expected one of {self.COMPRESSION_TYPES}"
+            )
+
+        self.partitioner = PinnedKeyPartitioner(parse_pinned_keys(settings.KAFKA_PINNED_KEYS))
         self.producer = None
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._pending: set[asyncio.Future] = set()
+        self.last_error: str | None = None
 
     async def start_producer(self):
         """Initialize the connection to Kafka."""
-        self.producer = AIOKafkaProducer(
-            bootstrap_servers=self.bootstrap_servers
+        producer = AIOKafkaProducer(
+            bootstrap_servers=self.bootstrap_servers,
+            linger_ms=self.linger_ms,
+            max_batch_size=self.max_batch_size,
+            compression_type=self.compression_type,
+            partitioner=self.partitioner,
         )
-        await self.producer.start()
+        try:
+            await producer.start()
+        except Exception:
+            await producer.stop()
+            raise
+        # Only expose the client once it is connected
+        self.producer = producer
         print(f"✅ Kafka Producer connected to {self.bootstrap_servers}")
 
     async def stop_producer(self):
-        """Gracefully shut down."""
+        """Gracefully shut down, delivering anything still buffered."""
         if self.producer:
+            await self.flush()
             await self.producer.stop()
+            self.producer = None
+
+    async def warm_up(self, topics: list[str]):
+        """
+        Fetch partition metadata for the given topics up front,
+        so the first send() does not pay for the metadata round trip.
+        """
+        for topic in topics:
+            partitions = await self.producer.partitions_for(topic)
+            print(f"🔥 Warmed up topic '{topic}' ({len(partitions)} partitions)")
+
+    def health(self) -> dict:
+        """Cheap health snapshot for the /health endpoint."""
+        if self.producer is None:
+            return {"status": "down", "in_flight": 0, "last_error": self.last_error}
+
+        brokers = self.producer.client.cluster.brokers()
+        return {
+            "status": "ok" if brokers else "degraded",
+            "brokers": len(brokers),
+            "in_flight": self.in_flight,
+            "last_error": self.last_error,
+        }
+
+    async def flush(self):
+        """Wait until every enqueued event has been acknowledged (or failed)."""
+        if not self.producer:
+            return
+        await self.producer.flush()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of events enqueued but not yet acknowledged by the broker."""
+        return len(self._pending)
+
+    def _serialize(self, event) -> tuple[bytes, list[tuple[str, bytes]]]:
+        """Serialize a Pydantic event to bytes plus its codec headers."""
+        return event.encode(self.codec)
+
+    async def send_event_nowait(self, event, key: str | None = None) -> asyncio.Future:
+        """
+        Enqueue an event without waiting for the broker acknowledgement.
+
+        Blocks only while the in-flight window is full. The message key
+        defaults to event.partition_key().
+
+        Returns:
+            Future resolving to the RecordMetadata of the delivered message.
+        """
+        payload_bytes, headers = self._serialize(event)
+        key = key or event.partition_key()
+        return await self.send_raw(
+            event.event_name,
+            payload_bytes,
+            key=key.encode("utf-8") if key else None,
+            headers=headers,
+            label=str(event.event_id),
+        )
+
+    async def send_raw(
+        self,
+        topic: str,
+        value: bytes,
+        key: bytes | None = None,
+        headers: list[tuple[str, bytes]] | None = None,
+        label: str | None = None,
+    ) -> asyncio.Future:
+        """
+        Enqueue an already-serialized message (used by the outbox relay).
+
+        Returns:
+            Future resolving to the RecordMetadata of the delivered message.
+        """
+        if not self.producer:
+            raise RuntimeError("Producer is not started. Call start_producer() first.")
+
+        await self._in_flight.acquire()
+        try:
+            delivery = await self.producer.send(topic, value, key=key, headers=headers)
+        except Exception:
+            self._in_flight.release()
+            raise
+
+        self._pending.add(delivery)
+        delivery.add_done_callback(
+            lambda fut, label=label or topic: self._on_delivery(label, fut)
+        )
+        return delivery
+
+    async def send_many(self, events) -> list[asyncio.Future]:
+        """
+        Enqueue many events at once; they are shipped in as few batches as possible.
+
+        Returns:
+            One delivery future per event, in the same order.
+        """
+        return [await self.send_event_nowait(event) for event in events]
+
+    def _on_delivery(self, label: str, fut: asyncio.Future):
+        self._in_flight.release()
+        self._pending.discard(fut)
+        if not fut.cancelled() and fut.exception() is not None:
+            self.last_error = str(fut.exception())
+            print(f"❌ Failed to deliver {label}: {fut.exception()}")
 
     async def send_event(self, event):
         """
-        Publishes a Pydantic event to the topic defined in the event itself.
+        Publishes a Pydantic event to the topic defined in the event itself
+        and waits for the broker acknowledgement. Delivery errors are re-raised;
+        use the outbox when an event must not be lost.
         
         Args:
             event: BaseEvent instance with event_name and payload
@@ -39,42 +226,123 @@ class EventProducer:
         if not self.producer:
             raise RuntimeError("Producer is not started. Call start_producer() first.")
 
-        topic_name = event.event_name
-        
-        # 1. Serialize Pydantic to JSON string
-        payload_json = event.model_dump_json()
-        
-        # 2. Encode to bytes (Kafka speaks bytes)
-        payload_bytes = payload_json.encode("utf-8")
-
         try:
-            # 3. Send and wait for acknowledgement
-            await self.producer.send_and_wait(topic_name, payload_bytes)
-            print(f"🚀 Sent event {event.event_id} to topic '{topic_name}'")
+            delivery = await self.send_event_nowait(event)
+            # Wait for acknowledgement
+            await delivery
+            print(f"🚀 Sent event {event.event_id} to topic '{event.event_name}'")
         except Exception as e:
             print(f"❌ Failed to send event: {e}")
+            raise
+
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    """Forwards rebalance callbacks to the owning EventConsumer."""
+    def __init__(self, owner: "EventConsumer"):
+        self.owner = owner
+
+    async def on_partitions_revoked(self, revoked):
+        await self.owner.on_partitions_revoked(revoked)
+
+    async def on_partitions_assigned(self, assigned):
+        await self.owner.on_partitions_assigned(assigned)
+
+
+class _FlowControl:
+    """
+    High/low watermark flow control for EventConsumer.consume_concurrent().
+    Pauses all assigned partitions above the high watermark and resumes
+    them once the in-flight backlog has drained to the low watermark.
+    Partitions assigned by a rebalance while paused are paused as well
+    (see EventConsumer.on_partitions_assigned), and resumed with the rest.
+    """
+    def __init__(self, owner: "EventConsumer", high: int, low: int, high_bytes: int):
+        self.owner = owner
+        self.high = high
+        self.low = min(low, high)
+        self.high_bytes = high_bytes
+        self.low_bytes = high_bytes // 2
+        self.events = 0
+        self.bytes = 0
+        self.paused = False
+
+    def acquire(self, size: int):
+        self.events += 1
+        self.bytes += size
+        if not self.paused and (
+            self.events >= self.high or (self.high_bytes and self.bytes >= self.high_bytes)
+        ):
+            self.paused = True
+            self.owner.consumer.pause(*self.owner.consumer.assignment())
+            print(f"⏸️ Backpressure: pausing fetch ({self.events} events / {self.bytes} B in flight)")
+
+    def release(self, size: int):
+        self.events -= 1
+        self.bytes -= size
+        if self.paused and self.events <= self.low and (
+            not self.high_bytes or self.bytes <= self.low_bytes
+        ):
+            self.paused = False
+            consumer = self.owner.consumer
+            if consumer is not None:
+                # The current assignment, so partitions assigned while paused too
+                consumer.resume(*consumer.assignment())
+            print(f"▶️ Backpressure released ({self.events} events in flight)")
+
+
+class BatchPartiallyHandled(Exception):
+    """
+    Raised by a consume_batches callback that finished some events of the
+    batch before failing; only the others are replayed one by one.
+    Chain the original error with `raise ... from e`.
+    """
+    def __init__(self, handled_ids):
+        self.handled_ids = set(handled_ids)
+        super().__init__(f"{len(self.handled_ids)} event(s) of the batch were handled before it failed")
 
 
 class EventConsumer:
     """
     Kafka event consumer for subscribing to domain events.
     """
-    def __init__(self, topic: str, group_id: str):
+    def __init__(
+        self,
+        topic: str,
+        group_id: str | None,
+        enable_auto_commit: bool = True,
+        auto_offset_reset: str = "earliest",
+    ):
         self.bootstrap_servers = settings.KAFKA_BROKER_URL
         self.topic = topic
+        # None: no consumer group, every partition is read by this consumer
         self.group_id = group_id
+        self.enable_auto_commit = enable_auto_commit
+        self.auto_offset_reset = auto_offset_reset
         self.consumer = None
         self.running = False
 
+        # Optional async (msg, exc) hook for events whose callback failed.
+        # Once it returns, the failed offset may be committed.
+        self.failure_handler = None
+
+        # Concurrent mode state, per assigned partition
+        self._offsets: dict[TopicPartition, OffsetTracker] = {}
+        self._executors: dict[TopicPartition, KeyOrderedExecutor] = {}
+        self._flow: _FlowControl | None = None
+
     async def start_consumer(self):
         """Connect to Kafka."""
         self.consumer = AIOKafkaConsumer(
-            self.topic,
             bootstrap_servers=self.bootstrap_servers,
             group_id=self.group_id,
-            # Start from the beginning if we miss data
-            auto_offset_reset="earliest" 
+            enable_auto_commit=self.enable_auto_commit,
+            # Bound how much aiokafka prefetches per poll / partition
+            fetch_max_bytes=settings.KAFKA_CONSUMER_FETCH_MAX_BYTES,
+            max_partition_fetch_bytes=settings.KAFKA_CONSUMER_MAX_PARTITION_FETCH_BYTES,
+            # "earliest": start from the beginning if we miss data
+            auto_offset_reset=self.auto_offset_reset
         )
+        self.consumer.subscribe([self.topic], listener=_RebalanceListener(self))
         await self.consumer.start()
         self.running = True
         print(f"👂 Consumer connected! Listening to '{self.topic}' (Group: {self.group_id})")
@@ -88,32 +356,227 @@ class EventConsumer:
     async def consume_events(self, callback_func):
         """
         Infinite loop that yields messages to the callback function.
+        Polls with a short timeout so that setting running = False
+        (e.g. from a SIGTERM handler) stops it promptly.
         
         Args:
-            callback_func: Async function to handle each event
+            callback_func: Async function to handle each decoded BaseEvent
         """
         if not self.consumer:
             raise RuntimeError("Consumer not started!")
 
         try:
             # The async loop
-            async for msg in self.consumer:
-                if not self.running:
-                    break
-                
-                if msg.value is None:
+            while self.running:
+                batches = await self.consumer.getmany(timeout_ms=500)
+                for messages in batches.values():
+                    for msg in messages:
+                        if msg.value is None:
+                            continue
+
+                        await self._handle_message(msg, callback_func)
+        finally:
+            await self.stop_consumer()
+
+    async def consume_concurrent(
+        self,
+        callback_func,
+        workers_per_partition: int = settings.WORKER_CONCURRENCY,
+        max_in_flight: int = settings.WORKER_MAX_IN_FLIGHT,
+        low_watermark: int = settings.WORKER_LOW_WATERMARK,
+        max_in_flight_bytes: int = settings.WORKER_MAX_IN_FLIGHT_BYTES,
+    ):
+        """
+        Infinite loop that handles several events of each partition at once.
+
+        Up to workers_per_partition events per partition run concurrently;
+        events with the same key stay in order. Offsets are committed
+        manually and only up to the highest contiguous completed offset, so a
+        crash never skips an unfinished event (at-least-once). A failed event
+        is passed to failure_handler; without one, its offset is not committed
+        and it is redelivered after a restart or rebalance. Create the
+        consumer with enable_auto_commit=False.
+
+        Flow control: once max_in_flight events (or max_in_flight_bytes of
+        payload) are fetched but not finished, every assigned partition is
+        paused so aiokafka stops prefetching; they are resumed when the
+        backlog drains to low_watermark (and half the byte limit). The poll
+        loop itself never blocks, so heartbeats and max_poll_interval_ms
+        stay healthy during a spike.
+
+        Args:
+            callback_func: Async function to handle each decoded BaseEvent
+            workers_per_partition: Max concurrent events per partition
+            max_in_flight: High watermark on unfinished events
+            low_watermark: Resume fetching at or below this many events
+            max_in_flight_bytes: High watermark on unfinished payload bytes (0 = off)
+        """
+        if not self.consumer:
+            raise RuntimeError("Consumer not started!")
+
+        flow = self._flow = _FlowControl(self, max_in_flight, low_watermark, max_in_flight_bytes)
+
+        try:
+            while self.running:
+                batches = await self.consumer.getmany(
+                    timeout_ms=200, max_records=max(max_in_flight - flow.events, 1)
+                )
+
+                for tp, messages in batches.items():
+                    offsets = self._offsets.setdefault(tp, OffsetTracker())
+                    executor = self._executors.get(tp)
+                    if executor is None:
+                        executor = self._executors[tp] = KeyOrderedExecutor(workers_per_partition)
+
+                    for msg in messages:
+                        offsets.start(msg.offset)
+                        size = len(msg.value or b"")
+                        flow.acquire(size)
+                        key = msg.key if msg.key is not None else tp
+                        task = executor.submit(
+                            key, lambda msg=msg: self._process_tracked(msg, callback_func, offsets)
+                        )
+                        task.add_done_callback(lambda _, size=size: flow.release(size))
+
+                await self._commit_completed()
+        finally:
+            self._flow = None
+            await self._drain(list(self._executors))
+            await self.stop_consumer()
+
+    async def _process_tracked(self, msg, callback_func, offsets: OffsetTracker):
+        if msg.value is None or await self._handle_message(msg, callback_func):
+            offsets.complete(msg.offset)
+
+    async def _commit_completed(self, partitions=None):
+        """Commit every partition whose contiguous completed prefix advanced."""
+        to_commit = {}
+        for tp in partitions if partitions is not None else list(self._offsets):
+            offsets = self._offsets.get(tp)
+            next_offset = offsets.committable() if offsets else None
+            if next_offset is not None:
+                to_commit[tp] = next_offset
+        if to_commit:
+            await self.consumer.commit(to_commit)
+
+    async def _drain(self, partitions):
+        """Finish in-flight work for the partitions and commit what completed."""
+        for tp in partitions:
+            executor = self._executors.pop(tp, None)
+            if executor is not None:
+                await executor.join()
+        try:
+            await self._commit_completed(partitions)
+        except Exception as e:
+            print(f"❌ Could not commit offsets: {e}")
+        for tp in partitions:
+            self._offsets.pop(tp, None)
+
+    async def on_partitions_revoked(self, revoked):
+        """Rebalance hook: hand partitions over only after their work is committed."""
+        tracked = [tp for tp in revoked if tp in self._offsets]
+        if tracked:
+            await self._drain(tracked)
+
+    async def on_partitions_assigned(self, assigned):
+        """Rebalance hook: new partitions would fetch at once, so pause them under backpressure."""
+        if self._flow is not None and self._flow.paused and assigned:
+            self.consumer.pause(*assigned)
+            print(f"⏸️ Backpressure: pausing {len(assigned)} newly assigned partition(s)")
+
+    async def consume_batches(
+        self,
+        batch_callback,
+        max_records: int = settings.WORKER_BATCH_SIZE,
+        timeout_ms: int = settings.WORKER_BATCH_TIMEOUT_MS,
+    ):
+        """
+        Infinite loop that hands whole batches of events to the callback.
+
+        Each poll returns up to max_records messages (waiting at most
+        timeout_ms for them); offsets are committed once per batch, after
+        the callback returns. If the batch callback fails, the batch is
+        replayed one message at a time so only the poison messages go to
+        failure_handler; events it reported done by raising
+        BatchPartiallyHandled are not replayed. Create the consumer with enable_auto_commit=False
+        so offsets only move after a batch has been handled.
+
+        Args:
+            batch_callback: Async function taking a list of decoded BaseEvents
+            max_records: Max messages per batch
+            timeout_ms: Max time to wait for a batch to fill up
+        """
+        if not self.consumer:
+            raise RuntimeError("Consumer not started!")
+
+        try:
+            while self.running:
+                batches = await self.consumer.getmany(timeout_ms=timeout_ms, max_records=max_records)
+                if not batches:
                     continue
 
-                try:
-                    # 1. Decode JSON
-                    payload = json.loads(msg.value.decode('utf-8'))
-                    print(f"📨 Received Event ID: {payload.get('event_id')}")
-                    
-                    # 2. Pass to Business Logic
-                    await callback_func(payload)
-                    
-                except Exception as e:
-                    print(f"❌ Error processing message: {e}")
-                    # In PROD: Log this to Sentry or a Dead Letter Queue
+                events, decoded = [], []
+                for tp, messages in batches.items():
+                    offsets = self._offsets.setdefault(tp, OffsetTracker())
+                    for msg in messages:
+                        offsets.start(msg.offset)
+                        if msg.value is None:
+                            offsets.complete(msg.offset)
+                            continue
+                        try:
+                            events.append(BaseEvent.decode(msg.value, msg.headers))
+                            decoded.append((tp, msg))
+                        except Exception as e:
+                            print(f"❌ Could not decode message {tp.topic}[{tp.partition}]@{msg.offset}: {e}")
+                            if await self._handle_failure(msg, e):
+                                offsets.complete(msg.offset)
+
+                if events:
+                    print(f"📦 Received batch of {len(events)} events")
+                    try:
+                        await batch_callback(events)
+                        for tp, msg in decoded:
+                            self._offsets[tp].complete(msg.offset)
+                    except Exception as e:
+                        handled = e.handled_ids if isinstance(e, BatchPartiallyHandled) else set()
+                        print(f"❌ Error processing batch, retrying {len(events) - len(handled)} one by one: {e.__cause__ or e}")
+                        for event, (tp, msg) in zip(events, decoded):
+                            if event.event_id in handled or await self._handle_message(
+                                msg, lambda event: batch_callback([event])
+                            ):
+                                self._offsets[tp].complete(msg.offset)
+
+                await self._commit_completed()
         finally:
             await self.stop_consumer()
+
+    async def _handle_message(self, msg, callback_func) -> bool:
+        """
+        Decode and handle one message.
+
+        Returns:
+            True if the offset may be committed: the event was handled,
+            or it failed and failure_handler took care of it.
+        """
+        try:
+            # 1. Decode with the codec negotiated in the headers
+            event = BaseEvent.decode(msg.value, msg.headers)
+            print(f"📨 Received Event ID: {event.event_id}")
+            
+            # 2. Pass to Business Logic
+            await callback_func(event)
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error processing message {msg.topic}[{msg.partition}]@{msg.offset}: {e}")
+            return await self._handle_failure(msg, e)
+
+    async def _handle_failure(self, msg, exc: Exception) -> bool:
+        if self.failure_handler is None:
+            return False
+        try:
+            await self.failure_handler(msg, exc)
+            return True
+        except Exception as e:
+            print(f"❌ Failure handler error for {msg.topic}[{msg.partition}]@{msg.offset}: {e}")
+            return False
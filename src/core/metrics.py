@@ -0,0 +1,86 @@
+"""
+In-process metrics registry.
+Plain counters and gauges that services bump on their hot paths and the
+worker prints periodically (and the API can return as JSON).
+"""
+from typing import Callable
+
+
+class Counter:
+    """Monotonic counter."""
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Value read on demand from a callback (e.g. a cache size)."""
+    __slots__ = ("name", "read")
+
+    def __init__(self, name: str, read: Callable[[], float]):
+        self.name = name
+        self.read = read
+
+    @property
+    def value(self) -> float:
+        return self.read()
+
+
+class Summary:
+    """Count, mean and max of observed values (e.g. latencies in ms)."""
+    __slots__ = ("name", "count", "total", "max")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def value(self) -> dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "mean": round(mean, 3), "max": round(self.max, 3)}
+
+
+class MetricsRegistry:
+    """Holds every metric of the process, keyed by dotted name."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Summary] = {}
+
+    def counter(self, name: str) -> Counter:
+        """Return the counter with this name, creating it on first use."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name)
+        return metric
+
+    def gauge(self, name: str, read: Callable[[], float]) -> Gauge:
+        """Register (or replace) a gauge."""
+        metric = self._metrics[name] = Gauge(name, read)
+        return metric
+
+    def summary(self, name: str) -> Summary:
+        """Return the summary with this name, creating it on first use."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Summary(name)
+        return metric
+
+    def snapshot(self) -> dict[str, float | dict[str, float]]:
+        """Current value of every metric."""
+        return {name: metric.value for name, metric in sorted(self._metrics.items())}
+
+
+metrics = MetricsRegistry()
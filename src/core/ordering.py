@@ -0,0 +1,94 @@
+"""
+Key-ordered concurrent execution.
+Lets a consumer work on many events at once while keeping events that share
+a key (e.g. one TikTok account) strictly in arrival order, and tracks which
+offsets are safe to commit when events finish out of order.
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class KeyOrderedExecutor:
+    """
+    Runs submitted jobs concurrently across keys, serially within a key.
+
+    Each key keeps a chain of tasks: a new job for a key waits for the
+    previous job of that key to finish (successfully or not) before it
+    starts. At most max_concurrency jobs run at once; submit() never
+    blocks, so callers bound the number of queued jobs themselves.
+    """
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tails: dict[Hashable, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of submitted jobs (running or queued) that have not finished yet."""
+        return len(self._tasks)
+
+    def submit(self, key: Hashable, job: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Schedule job() after every earlier job with the same key."""
+        previous = self._tails.get(key)
+        task = asyncio.create_task(self._run_after(previous, job))
+        self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+        return task
+
+    async def _run_after(self, previous: asyncio.Task | None, job: Callable[[], Awaitable[Any]]):
+        if previous is not None:
+            # Only ordering matters here; the previous job reports its own errors
+            await asyncio.wait([previous])
+        async with self._slots:
+            return await job()
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        self._tasks.discard(task)
+        if self._tails.get(key) is task:
+            del self._tails[key]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ Job for key {key!r} failed: {task.exception()}")
+
+    async def join(self):
+        """Wait for every submitted job to finish."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class OffsetTracker:
+    """
+    Tracks out-of-order completions for one partition.
+
+    Offsets are registered in fetch order with start() and reported with
+    complete(). committable() only ever advances to just past the highest
+    offset below which everything has completed, so a commit never skips
+    an event that is still running (or failed and was not handled).
+    """
+    def __init__(self):
+        self._started: deque[int] = deque()
+        self._completed: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._started)
+
+    def start(self, offset: int):
+        self._started.append(offset)
+
+    def complete(self, offset: int):
+        self._completed.add(offset)
+
+    def committable(self) -> int | None:
+        """
+        Pop the contiguous completed prefix.
+
+        Returns:
+            The next offset to commit, or None if nothing new can be committed.
+        """
+        last_done = None
+        while self._started and self._started[0] in self._completed:
+            last_done = self._started.popleft()
+            self._completed.discard(last_done)
+        return None if last_done is None else last_done + 1
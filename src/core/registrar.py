@@ -1,7 +1,9 @@
+from contextlib import asynccontextmanager
 from starlette.middleware.gzip import GZipMiddleware
 from src.api.v1.api import api_router
 from src.rate_limiter import limiter
 from src.core.config import settings
+from src.core.kafka import EventProducer
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,10 +23,33 @@ def custom_generate_unique_id(route: APIRoute) -> str:
         return f"default-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start one Kafka producer for the whole application lifetime.
+    Requests reuse it through DI, so publishing is only an enqueue.
+    """
+    producer = EventProducer()
+    try:
+        await producer.start_producer()
+        await producer.warm_up(settings.KAFKA_WARMUP_TOPICS.replace(" ", "").split(","))
+    except Exception as e:
+        # Keep serving non-Kafka routes; /health reports the producer as down
+        producer.last_error = str(e)
+        print(f"❌ Kafka Producer failed to start: {e}")
+    app.state.event_producer = producer
+
+    yield
+
+    # Drain and flush everything still buffered before exiting
+    await producer.stop_producer()
+
+
 def register_app():
     app = FastAPI(
         title=settings.PROJECT_NAME,
         generate_unique_id_function=custom_generate_unique_id,
+        lifespan=lifespan,
     )
 
     register_router(app)
@@ -0,0 +1,158 @@
+"""
+Non-blocking retries for failed events.
+Failed messages are re-published to delay tiers (<topic>.retry.<delay>) and,
+after the last attempt, to a dead-letter topic (<topic>.dlq), so the main
+partition never waits on a poison message or a flaky downstream.
+"""
+import asyncio
+import time
+
+from src.core.config import settings
+from src.core.kafka import EventConsumer, EventProducer
+
+# Kafka header names used for retry routing
+ATTEMPT_HEADER = "ep-attempt"
+NOT_BEFORE_HEADER = "ep-not-before"
+ORIGINAL_TOPIC_HEADER = "ep-original-topic"
+ERROR_HEADER = "ep-error"
+ERROR_TYPE_HEADER = "ep-error-type"
+FAILED_AT_HEADER = "ep-failed-at"
+
+ROUTING_HEADERS = {
+    ATTEMPT_HEADER, NOT_BEFORE_HEADER, ORIGINAL_TOPIC_HEADER,
+    ERROR_HEADER, ERROR_TYPE_HEADER, FAILED_AT_HEADER,
+}
+
+_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_delays(raw: str) -> list[tuple[str, float]]:
+    """Parse "10s,1m,10m" into [("10s", 10.0), ("1m", 60.0), ("10m", 600.0)]."""
+    delays = []
+    for label in raw.replace(" ", "").split(","):
+        if label:
+            delays.append((label, float(label[:-1]) * _UNITS[label[-1]]))
+    return delays
+
+
+def retry_topic(base_topic: str, label: str) -> str:
+    return f"{base_topic}.retry.{label}"
+
+
+def dlq_topic(base_topic: str) -> str:
+    return f"{base_topic}.dlq"
+
+
+def header_value(msg, name: str) -> str | None:
+    """Return a header of a consumed message as str, or None."""
+    for key, value in msg.headers or ():
+        if key == name:
+            return value.decode("utf-8")
+    return None
+
+
+def strip_routing_headers(headers) -> list[tuple[str, bytes]]:
+    """Drop retry/DLQ metadata, keeping the original envelope headers."""
+    return [(key, value) for key, value in headers or () if key not in ROUTING_HEADERS]
+
+
+class RetryRouter:
+    """
+    EventConsumer failure handler.
+
+    Re-publishes a failed message to the retry tier matching its attempt
+    number, or to the DLQ once max_attempts is exhausted. It waits for the
+    broker ack, so the original offset is only committed once the message
+    is safely stored elsewhere.
+    """
+    def __init__(
+        self,
+        producer: EventProducer,
+        base_topic: str,
+        delays: list[tuple[str, float]] | None = None,
+        max_attempts: int = settings.RETRY_MAX_ATTEMPTS,
+    ):
+        self.producer = producer
+        self.base_topic = base_topic
+        self.delays = delays or parse_delays(settings.RETRY_DELAYS)
+        self.max_attempts = max_attempts
+
+    @property
+    def retry_topics(self) -> list[str]:
+        return [retry_topic(self.base_topic, label) for label, _ in self.delays]
+
+    async def __call__(self, msg, exc: Exception):
+        attempt = int(header_value(msg, ATTEMPT_HEADER) or 0) + 1
+        headers = strip_routing_headers(msg.headers)
+        headers += [
+            (ATTEMPT_HEADER, str(attempt).encode()),
+            (ORIGINAL_TOPIC_HEADER, (header_value(msg, ORIGINAL_TOPIC_HEADER) or msg.topic).encode()),
+            (ERROR_TYPE_HEADER, type(exc).__name__.encode()),
+            (ERROR_HEADER, str(exc)[:1000].encode()),
+            (FAILED_AT_HEADER, str(int(time.time() * 1000)).encode()),
+        ]
+
+        if attempt <= self.max_attempts:
+            # Attempts beyond the configured tiers reuse the longest delay
+            label, delay = self.delays[min(attempt, len(self.delays)) - 1]
+            topic = retry_topic(self.base_topic, label)
+            headers.append((NOT_BEFORE_HEADER, str(int((time.time() + delay) * 1000)).encode()))
+        else:
+            topic = dlq_topic(self.base_topic)
+
+        delivery = await self.producer.send_raw(topic, msg.value, key=msg.key, headers=headers)
+        await delivery
+        print(f"↪️ Routed {msg.topic}[{msg.partition}]@{msg.offset} to '{topic}' (attempt {attempt})")
+
+
+class DelayedRetryConsumer(EventConsumer):
+    """
+    Consumer for one retry tier.
+
+    Messages in a tier share the same delay, so they become due in offset
+    order. When the head of a partition is not due yet, the partition is
+    paused and resumed when it is, instead of sleeping or busy-polling.
+    """
+    async def consume_delayed(self, callback_func):
+        """
+        Infinite loop that hands due messages to the callback function.
+
+        Args:
+            callback_func: Async function to handle each decoded BaseEvent
+        """
+        if not self.consumer:
+            raise RuntimeError("Consumer not started!")
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            while self.running:
+                batches = await self.consumer.getmany(timeout_ms=500)
+
+                for tp, messages in batches.items():
+                    next_offset = None
+                    for msg in messages:
+                        wait = int(header_value(msg, NOT_BEFORE_HEADER) or 0) / 1000 - time.time()
+                        if wait > 0:
+                            self._pause_until(tp, msg.offset, wait, loop)
+                            break
+
+                        if msg.value is not None and not await self._handle_message(msg, callback_func):
+                            # Could not even re-route it (e.g. broker down): try again shortly
+                            self._pause_until(tp, msg.offset, 1.0, loop)
+                            break
+                        next_offset = msg.offset + 1
+
+                    if next_offset is not None:
+                        await self.consumer.commit({tp: next_offset})
+        finally:
+            await self.stop_consumer()
+
+    def _pause_until(self, tp, offset: int, delay: float, loop: asyncio.AbstractEventLoop):
+        self.consumer.seek(tp, offset)
+        self.consumer.pause(tp)
+        loop.call_later(delay, self._resume, tp)
+
+    def _resume(self, tp):
+        if self.consumer and tp in self.consumer.assignment():
+            self.consumer.resume(tp)
@@ -1,4 +1,6 @@
 from src.core.db import get_db
+from src.core.dependencies import get_event_producer
+from src.core.kafka import EventProducer
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -26,13 +28,19 @@ if __name__ == "__main__":
         print(f"Fast API start failed: {e}")
 
 @app.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check(
+    db: AsyncSession = Depends(get_db),
+    producer: EventProducer = Depends(get_event_producer),
+):
     """
-    Simple health check ensuring DB connection works via DI.
+    Simple health check ensuring DB connection works via DI,
+    plus the state of the shared Kafka producer.
     """
+    kafka = producer.health()
     try:
         # Simple query to check connection
         await db.execute(text("SELECT 1"))
-        return {"status": "ok", "db": "connected"}
+        status = "ok" if kafka["status"] == "ok" else "degraded"
+        return {"status": status, "db": "connected", "kafka": kafka}
     except Exception as e:
-        return {"status": "error", "db": str(e)}
\ No newline at end of file
+        return {"status": "error", "db": str(e), "kafka": kafka}
\ No newline at end of file
@@ -3,3 +3,7 @@ from .user import UserModel
 from .account import MonitoredAccountModel
 from .video import ProcessedVideoModel
 from .subscription import SubscriptionModel
+from .outbox import EventOutboxModel
+from .processed_event import ProcessedEventModel
+from .notification_delivery import NotificationDeliveryModel
+from .pending_notification import PendingNotificationModel
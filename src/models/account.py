@@ -5,7 +5,7 @@ Represents TikTok accounts being tracked for new content.
 import uuid
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
-from sqlalchemy import String, Boolean, DateTime, func
+from sqlalchemy import String, Boolean, DateTime, Float, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.models.base import Base
@@ -26,6 +26,14 @@ class MonitoredAccountModel(Base):
     platform: Mapped[str] = mapped_column(String, default="tiktok", nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     last_scraped_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Polling schedule: when the tracker checks the account next (NULL = now),
+    # derived from its newest video and smoothed gap between videos
+    next_poll_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    last_posted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    avg_post_interval_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Tracker replica currently polling the account, until its lease expires
+    leased_by: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    leased_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -0,0 +1,32 @@
+"""
+Notification Delivery SQLAlchemy model.
+Fan-out progress of one event, so a redelivered event resumes where it stopped.
+"""
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Integer, String, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from src.models.base import Base
+
+
+class NotificationDeliveryModel(Base):
+    """
+    Keyset checkpoint of a streamed fan-out: subscribers are notified in
+    user-id order and last_user_id is the highest one whose chunk finished.
+    """
+    __tablename__ = "notification_deliveries"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    account_username: Mapped[str] = mapped_column(String, nullable=False)
+    last_user_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True
+    )
+
+    def __repr__(self):
+        return f"<NotificationDelivery(event_id='{self.event_id}', sent={self.sent}, done={self.completed_at is not None})>"
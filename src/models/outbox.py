@@ -0,0 +1,31 @@
+"""
+Event Outbox SQLAlchemy model.
+Domain events waiting to be relayed to Kafka (transactional outbox pattern).
+"""
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, String, LargeBinary, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from src.models.base import Base
+
+
+class EventOutboxModel(Base):
+    """
+    Serialized events written in the same transaction as the state change
+    that produced them. The outbox relay publishes and then deletes them.
+    """
+    __tablename__ = "event_outbox"
+
+    # Monotonic id so the relay drains events in insertion order
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), unique=True, nullable=False)
+    topic: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    headers: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<EventOutbox(id={self.id}, topic='{self.topic}', event_id='{self.event_id}')>"
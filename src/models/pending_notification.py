@@ -0,0 +1,34 @@
+"""
+Pending Notification SQLAlchemy model.
+Per-user notifications buffered for a digest email (coalescing window).
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, String, DateTime, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from src.models.base import Base
+
+
+class PendingNotificationModel(Base):
+    """
+    One video waiting to be mailed to one user. Rows are written together
+    with the event's processed_events entry and deleted when the user's
+    digest is sent, so the buffer survives worker restarts.
+    """
+    __tablename__ = "pending_notifications"
+    __table_args__ = (UniqueConstraint("user_id", "event_id", name="uq_pending_notifications_user_event"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    email: Mapped[str] = mapped_column(String, nullable=False)
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    author_username: Mapped[str] = mapped_column(String, nullable=False)
+    platform_id: Mapped[str] = mapped_column(String, nullable=False)
+    video_url: Mapped[str] = mapped_column(String, nullable=False)
+    # Digest deadline of the user's window; the first entry of a window sets it
+    flush_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<PendingNotification(user_id='{self.user_id}', video='{self.platform_id}')>"
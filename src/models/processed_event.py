@@ -0,0 +1,28 @@
+"""
+Processed Event SQLAlchemy model.
+Records consumed event IDs so redelivered events are not handled twice.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from src.models.base import Base
+
+
+class ProcessedEventModel(Base):
+    """
+    Idempotency log of the notifier: one row per handled BaseEvent.event_id.
+    A row is inserted when a worker claims the event, before any side
+    effect, and completed_at is set once it was handled; an uncompleted
+    claim older than IDEMPOTENCY_CLAIM_SECONDS may be claimed again.
+    """
+    __tablename__ = "processed_events"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    event_name: Mapped[str] = mapped_column(String, nullable=False)
+    processed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<ProcessedEvent(event_id='{self.event_id}', event_name='{self.event_name}')>"
@@ -1,8 +1,9 @@
 from src.models.base import Base
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, DateTime, func
+from sqlalchemy import ForeignKey, DateTime, Index, String, func
+from sqlalchemy.dialects.postgresql import ARRAY
 import uuid
 from datetime import datetime
 
@@ -16,9 +17,14 @@ class SubscriptionModel(Base):
     Represents a user's subscription to a monitored account.
     """
     __tablename__ = "subscriptions"
+    # Subscribers of one account in user-id order (keyset-paginated fan-out)
+    __table_args__ = (Index("ix_subscriptions_account_id_user_id", "account_id", "user_id"),)
 
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
     account_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("monitored_accounts.id"), primary_key=True)
+    # Optional caption filters: only videos whose caption contains one of
+    # these keywords/hashtags (case-insensitive) are notified. NULL = all videos
+    keywords: Mapped[Optional[list[str]]] = mapped_column(ARRAY(String), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships to access the objects
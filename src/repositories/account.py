@@ -2,8 +2,9 @@
 Monitored Account repository.
 Handles CRUD operations for monitored TikTok accounts.
 """
+from datetime import datetime, timedelta
 from typing import Sequence
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.account import MonitoredAccountModel
 from src.repositories.base import BaseRepository
@@ -13,7 +14,8 @@ class MonitoredAccountRepository(BaseRepository[MonitoredAccountModel]):
     """Repository for MonitoredAccount model operations."""
     
     def __init__(self, db: AsyncSession):
-        super().__init__(db, MonitoredAccountModel)
+        super().__init__(MonitoredAccountModel)
+        self.db = db
 
     async def get_by_username(self, username: str) -> MonitoredAccountModel | None:
         """Find a monitored account by username."""
@@ -28,3 +30,44 @@ class MonitoredAccountRepository(BaseRepository[MonitoredAccountModel]):
             select(MonitoredAccountModel).where(MonitoredAccountModel.is_active.is_(True))
         )
         return result.scalars().all()
+
+    async def lease_due_accounts(self, owner: str, limit: int, lease_seconds: float) -> Sequence[MonitoredAccountModel]:
+        """
+        Claim up to `limit` active accounts that are due for a poll.
+        Rows locked by another replica's claim are skipped and claimed rows
+        get a lease, so no two replicas poll an account at once; accounts
+        whose lease expired (their replica died) are due again.
+        Note: The lease only holds once the caller commits.
+        """
+        now = func.now()
+        due = (
+            select(MonitoredAccountModel.id)
+            .where(MonitoredAccountModel.is_active.is_(True))
+            .where(or_(MonitoredAccountModel.next_poll_at.is_(None), MonitoredAccountModel.next_poll_at <= now))
+            .where(or_(MonitoredAccountModel.leased_until.is_(None), MonitoredAccountModel.leased_until <= now))
+            .order_by(MonitoredAccountModel.next_poll_at.asc().nulls_first())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(MonitoredAccountModel)
+            .where(MonitoredAccountModel.id.in_(due.scalar_subquery()))
+            .values(leased_by=owner, leased_until=now + timedelta(seconds=lease_seconds))
+            .returning(MonitoredAccountModel)
+        )
+        result = await self.db.execute(
+            select(MonitoredAccountModel).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+
+    async def next_due_at(self) -> datetime | None:
+        """Earliest time any active account becomes claimable (None if there are none)."""
+        now = func.now()
+        result = await self.db.execute(
+            select(func.min(func.greatest(
+                func.coalesce(MonitoredAccountModel.next_poll_at, now),
+                func.coalesce(MonitoredAccountModel.leased_until, now),
+            )))
+            .where(MonitoredAccountModel.is_active.is_(True))
+        )
+        return result.scalar_one()
@@ -0,0 +1,59 @@
+"""
+Notification Delivery repository.
+Reads and upserts fan-out checkpoints of streamed notifications.
+"""
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.notification_delivery import NotificationDeliveryModel
+from src.repositories.base import BaseRepository
+
+
+class NotificationDeliveryRepository(BaseRepository[NotificationDeliveryModel]):
+    """Repository for NotificationDelivery model operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(NotificationDeliveryModel)
+        self.db = db
+
+    async def get_progress(self, event_id: UUID) -> NotificationDeliveryModel | None:
+        result = await self.db.execute(
+            select(NotificationDeliveryModel).where(NotificationDeliveryModel.event_id == event_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def save_progress(
+        self,
+        event_id: UUID,
+        account_username: str,
+        last_user_id: UUID | None,
+        sent: int,
+        failed: int,
+        completed: bool = False,
+    ) -> None:
+        """
+        Upsert the checkpoint of an event in one statement.
+        Note: You must call commit() to persist changes.
+        """
+        values = dict(
+            event_id=event_id,
+            account_username=account_username,
+            last_user_id=last_user_id,
+            sent=sent,
+            failed=failed,
+            completed_at=func.now() if completed else None,
+        )
+        stmt = insert(NotificationDeliveryModel).values(values)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationDeliveryModel.event_id],
+                set_={
+                    "last_user_id": stmt.excluded.last_user_id,
+                    "sent": stmt.excluded.sent,
+                    "failed": stmt.excluded.failed,
+                    "completed_at": stmt.excluded.completed_at,
+                    "updated_at": func.now(),
+                },
+            )
+        )
@@ -0,0 +1,52 @@
+"""
+Event Outbox repository.
+Queues domain events inside the caller's transaction and lets relays claim them.
+"""
+from typing import Sequence
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.config import settings
+from src.models.outbox import EventOutboxModel
+from src.repositories.base import BaseRepository
+from src.schemas.events import BaseEvent
+
+
+class EventOutboxRepository(BaseRepository[EventOutboxModel]):
+    """Repository for EventOutbox model operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(EventOutboxModel)
+        self.db = db
+
+    def add_event(self, event: BaseEvent, topic: str | None = None) -> EventOutboxModel:
+        """
+        Queue an event in the current transaction.
+        Note: It is only visible to the relay once the caller commits.
+        """
+        payload, headers = event.encode(settings.EVENT_CODEC)
+        entry = EventOutboxModel(
+            event_id=event.event_id,
+            topic=topic or event.event_name,
+            key=event.partition_key(),
+            payload=payload,
+            headers={key: value.decode("utf-8") for key, value in headers},
+        )
+        return self.add(self.db, entry)
+
+    async def claim_batch(self, limit: int) -> Sequence[EventOutboxModel]:
+        """
+        Lock up to `limit` of the oldest pending events.
+        Rows locked by another relay are skipped, so relays never block each other.
+        """
+        result = await self.db.execute(
+            select(EventOutboxModel)
+            .order_by(EventOutboxModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def delete_many(self, ids: Sequence[int]) -> None:
+        """Remove events that have been published."""
+        if ids:
+            await self.db.execute(delete(EventOutboxModel).where(EventOutboxModel.id.in_(ids)))
@@ -0,0 +1,56 @@
+"""
+Pending Notification repository.
+Buffers per-user notifications for digests and hands them out at flush time.
+"""
+from datetime import datetime
+from typing import Iterable, Sequence
+from uuid import UUID
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.pending_notification import PendingNotificationModel
+from src.repositories.base import BaseRepository
+
+
+class PendingNotificationRepository(BaseRepository[PendingNotificationModel]):
+    """Repository for PendingNotification model operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(PendingNotificationModel)
+        self.db = db
+
+    async def add_many(self, rows: list[dict]) -> None:
+        """
+        Buffer notifications with one INSERT ... ON CONFLICT DO NOTHING
+        (a redelivered event does not queue the same video twice).
+        Note: You must call commit() to persist changes.
+        """
+        if rows:
+            await self.db.execute(insert(PendingNotificationModel).values(rows).on_conflict_do_nothing())
+
+    async def pending_users(self) -> Sequence[tuple[UUID, datetime, int]]:
+        """(user_id, earliest flush_at, count) of every user with buffered notifications."""
+        result = await self.db.execute(
+            select(
+                PendingNotificationModel.user_id,
+                func.min(PendingNotificationModel.flush_at),
+                func.count(),
+            ).group_by(PendingNotificationModel.user_id)
+        )
+        return result.tuples().all()
+
+    async def take_for_users(self, user_ids: Iterable[UUID]) -> Sequence[PendingNotificationModel]:
+        """
+        Delete and return every buffered notification of these users.
+        The rows stay locked until the caller commits, so another worker
+        flushing the same user gets nothing instead of a duplicate digest.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return []
+        result = await self.db.execute(
+            delete(PendingNotificationModel)
+            .where(PendingNotificationModel.user_id.in_(user_ids))
+            .returning(PendingNotificationModel)
+        )
+        return sorted(result.scalars().all(), key=lambda row: row.id)
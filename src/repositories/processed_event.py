@@ -0,0 +1,75 @@
+"""
+Processed Event repository.
+Idempotency log claims and bulk upserts for the notifier.
+"""
+from datetime import timedelta
+from typing import Iterable
+from uuid import UUID
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.processed_event import ProcessedEventModel
+from src.repositories.base import BaseRepository
+from src.schemas.events import BaseEvent
+
+
+class ProcessedEventRepository(BaseRepository[ProcessedEventModel]):
+    """Repository for ProcessedEvent model operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ProcessedEventModel)
+        self.db = db
+
+    async def claim(self, events: Iterable[BaseEvent], lease_seconds: float) -> set[UUID]:
+        """
+        Claim events for handling with one INSERT ... ON CONFLICT DO UPDATE
+        ... RETURNING: new events, plus events whose claim was never
+        completed and is older than lease_seconds (their worker died).
+        Returns the ids this call claimed; a concurrent claimer of the same
+        event blocks on the row and then gets nothing.
+        Note: You must call commit() to persist changes.
+        """
+        rows = [{"event_id": event.event_id, "event_name": event.event_name} for event in events]
+        if not rows:
+            return set()
+        stmt = insert(ProcessedEventModel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProcessedEventModel.event_id],
+            set_={"processed_at": func.now()},
+            where=(
+                ProcessedEventModel.completed_at.is_(None)
+                & (ProcessedEventModel.processed_at <= func.now() - timedelta(seconds=lease_seconds))
+            ),
+        ).returning(ProcessedEventModel.event_id)
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+
+    async def release(self, event_ids: Iterable[UUID]) -> None:
+        """
+        Drop uncompleted claims, so a redelivery handles the events again.
+        Note: You must call commit() to persist changes.
+        """
+        event_ids = list(event_ids)
+        if event_ids:
+            await self.db.execute(
+                delete(ProcessedEventModel)
+                .where(ProcessedEventModel.event_id.in_(event_ids))
+                .where(ProcessedEventModel.completed_at.is_(None))
+            )
+
+    async def mark_processed(self, events: Iterable[BaseEvent]) -> None:
+        """
+        Record events as handled (completing their claim, if any) with one
+        INSERT ... ON CONFLICT DO UPDATE.
+        Note: You must call commit() to persist changes.
+        """
+        rows = [
+            {"event_id": event.event_id, "event_name": event.event_name, "completed_at": func.now()}
+            for event in events
+        ]
+        if rows:
+            stmt = insert(ProcessedEventModel).values(rows)
+            await self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[ProcessedEventModel.event_id],
+                set_={"completed_at": func.now()},
+            ))
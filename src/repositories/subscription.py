@@ -1,4 +1,10 @@
-from sqlalchemy import select
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row, String, any_, bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.user import UserModel
 from src.models.subscription import SubscriptionModel
@@ -20,4 +26,135 @@ class SubscriptionRepository:
             .where(UserModel.is_active)
         )
         result = await self.db.execute(stmt)
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def get_subscribers_for_accounts(self, tiktok_usernames) -> dict[str, list[Row]]:
+        """
+        Finds the subscribers of many TikTok usernames in one round trip.
+        The names are sent as a single array parameter (username = ANY(:names)),
+        so the statement stays the same whatever the batch size.
+
+        Returns:
+            {username: [(id, email, keywords), ...]}; usernames without
+            subscribers are absent.
+        """
+        names = list(dict.fromkeys(tiktok_usernames))
+        if not names:
+            return {}
+
+        stmt = (
+            select(MonitoredAccountModel.username, UserModel.id, UserModel.email, SubscriptionModel.keywords)
+            .join(SubscriptionModel, SubscriptionModel.user_id == UserModel.id)
+            .join(MonitoredAccountModel, SubscriptionModel.account_id == MonitoredAccountModel.id)
+            .where(MonitoredAccountModel.username == any_(bindparam("names", names, type_=ARRAY(String))))
+            .where(UserModel.is_active)
+        )
+        result = await self.db.execute(stmt)
+
+        subscribers = defaultdict(list)
+        for row in result.all():
+            subscribers[row.username].append(row)
+        return dict(subscribers)
+
+    async def count_subscribers(self, tiktok_usernames) -> dict[str, int]:
+        """
+        Number of active subscribers per TikTok username, in one query.
+        Usernames without subscribers are absent.
+        """
+        names = list(dict.fromkeys(tiktok_usernames))
+        if not names:
+            return {}
+
+        stmt = (
+            select(MonitoredAccountModel.username, func.count())
+            .select_from(SubscriptionModel)
+            .join(UserModel, SubscriptionModel.user_id == UserModel.id)
+            .join(MonitoredAccountModel, SubscriptionModel.account_id == MonitoredAccountModel.id)
+            .where(MonitoredAccountModel.username == any_(bindparam("names", names, type_=ARRAY(String))))
+            .where(UserModel.is_active)
+            .group_by(MonitoredAccountModel.username)
+        )
+        result = await self.db.execute(stmt)
+        return dict(result.tuples().all())
+
+    async def stream_subscribers(
+        self, tiktok_username: str, chunk_size: int, after_user_id: uuid.UUID | None = None
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields the subscribers of one account as chunks of up to chunk_size
+        (id, email, keywords) rows, in user-id order, starting after after_user_id.
+
+        Each chunk is its own keyset query on (account_id, user_id), so no
+        cursor or transaction spans the fan-out: the caller may commit a
+        checkpoint between chunks, and memory stays flat whatever the size.
+        """
+        account_id = (
+            select(MonitoredAccountModel.id)
+            .where(MonitoredAccountModel.username == tiktok_username)
+            .scalar_subquery()
+        )
+        while True:
+            stmt = (
+                select(UserModel.id, UserModel.email, SubscriptionModel.keywords)
+                .join(SubscriptionModel, SubscriptionModel.user_id == UserModel.id)
+                .where(SubscriptionModel.account_id == account_id)
+                .where(UserModel.is_active)
+                .order_by(SubscriptionModel.user_id)
+                .limit(chunk_size)
+            )
+            if after_user_id is not None:
+                stmt = stmt.where(SubscriptionModel.user_id > after_user_id)
+
+            chunk = (await self.db.execute(stmt)).all()
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after_user_id = chunk[-1].id
+
+    async def add_subscription(
+        self, user_id: uuid.UUID, account_id: uuid.UUID, keywords: list[str] | None = None
+    ) -> datetime | None:
+        """
+        Subscribe a user to an account, optionally filtered by caption keywords.
+
+        Returns:
+            The created_at of the new row, or None if it already existed.
+        """
+        result = await self.db.execute(
+            insert(SubscriptionModel)
+            .values(user_id=user_id, account_id=account_id, keywords=keywords)
+            .on_conflict_do_nothing()
+            .returning(SubscriptionModel.created_at)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_subscription(self, user_id: uuid.UUID, account_id: uuid.UUID) -> SubscriptionModel | None:
+        result = await self.db.execute(
+            select(SubscriptionModel)
+            .where(SubscriptionModel.user_id == user_id)
+            .where(SubscriptionModel.account_id == account_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_keywords(
+        self, user_id: uuid.UUID, account_id: uuid.UUID, keywords: list[str] | None
+    ) -> bool:
+        """Replace a subscription's keyword filters; False if nothing changed."""
+        result = await self.db.execute(
+            update(SubscriptionModel)
+            .where(SubscriptionModel.user_id == user_id)
+            .where(SubscriptionModel.account_id == account_id)
+            .where(SubscriptionModel.keywords.is_distinct_from(keywords))
+            .values(keywords=keywords)
+        )
+        return result.rowcount > 0
+
+    async def remove_subscription(self, user_id: uuid.UUID, account_id: uuid.UUID) -> bool:
+        """Unsubscribe a user from an account; False if there was nothing to remove."""
+        result = await self.db.execute(
+            delete(SubscriptionModel)
+            .where(SubscriptionModel.user_id == user_id)
+            .where(SubscriptionModel.account_id == account_id)
+        )
+        return result.rowcount > 0
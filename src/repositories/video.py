@@ -2,7 +2,10 @@
 Processed Video repository.
 Tracks which videos have already been processed to prevent duplicates.
 """
-from sqlalchemy import select
+from datetime import datetime
+from typing import AsyncIterator, Iterable
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.video import ProcessedVideoModel
 from src.repositories.base import BaseRepository
@@ -12,7 +15,8 @@ class ProcessedVideoRepository(BaseRepository[ProcessedVideoModel]):
     """Repository for ProcessedVideo model operations."""
     
     def __init__(self, db: AsyncSession):
-        super().__init__(db, ProcessedVideoModel)
+        super().__init__(ProcessedVideoModel)
+        self.db = db
 
     async def is_video_processed(self, video_id: str) -> bool:
         """Check if a video has already been processed."""
@@ -20,3 +24,52 @@ class ProcessedVideoRepository(BaseRepository[ProcessedVideoModel]):
             select(ProcessedVideoModel).where(ProcessedVideoModel.video_id == video_id)
         )
         return result.scalar_one_or_none() is not None
+
+    def mark_processed(self, video_id: str, account_id) -> ProcessedVideoModel:
+        """
+        Add a dedup record for a video to the current transaction.
+        Note: You must call commit() to persist changes.
+        """
+        return self.add(self.db, ProcessedVideoModel(video_id=video_id, account_id=account_id))
+
+    async def insert_new(self, video_ids: Iterable[str], account_id) -> set[str]:
+        """
+        Add dedup records for a batch of videos in one statement, returning
+        the IDs that were not recorded before. The insert is the dedup
+        check, so of two transactions racing on a video exactly one gets
+        it back.
+        Note: You must call commit() to persist changes.
+        """
+        rows = [{"video_id": video_id, "account_id": account_id} for video_id in dict.fromkeys(video_ids)]
+        if not rows:
+            return set()
+        result = await self.db.execute(
+            insert(ProcessedVideoModel)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[ProcessedVideoModel.video_id])
+            .returning(ProcessedVideoModel.video_id)
+        )
+        return set(result.scalars().all())
+
+    async def find_existing(self, video_ids: Iterable[str]) -> set[str]:
+        """Which of the given videos are already recorded (one read-only query)."""
+        ids = list(dict.fromkeys(video_ids))
+        if not ids:
+            return set()
+        result = await self.db.execute(
+            select(ProcessedVideoModel.video_id)
+            .where(ProcessedVideoModel.video_id == any_(bindparam("ids", ids, type_=ARRAY(String))))
+        )
+        return set(result.scalars().all())
+
+    async def stream_video_ids(self, chunk_size: int, since: datetime | None = None) -> AsyncIterator[list[str]]:
+        """
+        Yield all recorded video IDs (or those recorded since `since`) in
+        chunks, through a server-side cursor so memory stays flat.
+        """
+        stmt = select(ProcessedVideoModel.video_id).execution_options(yield_per=chunk_size)
+        if since is not None:
+            stmt = stmt.where(ProcessedVideoModel.created_at >= since)
+        result = await self.db.stream_scalars(stmt)
+        async for chunk in result.partitions():
+            yield list(chunk)
@@ -0,0 +1,105 @@
+"""
+Wire codecs for domain events.
+Each codec turns a BaseEvent into bytes and back; the codec id travels in the
+Kafka message headers so producers and consumers can negotiate the format.
+"""
+import abc
+import json
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
+    from src.schemas.events import BaseEvent
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class EventCodec(abc.ABC):
+    """
+    Base class for event codecs.
+    Subclasses set codec_id and implement dumps/loads.
+    """
+    codec_id: ClassVar[str]
+
+    def encode(self, event: "BaseEvent") -> bytes:
+        """Serialize an event to bytes."""
+        return self.dumps(event.model_dump(mode="python"))
+
+    def decode(self, data: bytes, event_cls: type["BaseEvent"]) -> "BaseEvent":
+        """Deserialize bytes into an instance of event_cls."""
+        return event_cls.model_validate(self.loads(data))
+
+    @abc.abstractmethod
+    def dumps(self, obj: dict) -> bytes:
+        """Serialize a plain dict (e.g. an upgraded payload)."""
+
+    @abc.abstractmethod
+    def loads(self, data: bytes) -> dict:
+        """Parse bytes into a plain dict."""
+
+
+class JsonCodec(EventCodec):
+    """
+    Plain JSON, the historical format.
+    Messages without codec headers are decoded with this codec.
+    """
+    codec_id = "json"
+
+    def encode(self, event: "BaseEvent") -> bytes:
+        return event.model_dump_json().encode("utf-8")
+
+    def decode(self, data: bytes, event_cls: type["BaseEvent"]) -> "BaseEvent":
+        # Pydantic's own JSON parser skips the intermediate dict
+        return event_cls.model_validate_json(data)
+
+    def dumps(self, obj: dict) -> bytes:
+        return json.dumps(obj, default=str).encode("utf-8")
+
+    def loads(self, data: bytes) -> dict:
+        return json.loads(data)
+
+
+class OrjsonCodec(EventCodec):
+    """JSON encoded with orjson (native UUID/datetime support)."""
+    codec_id = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("The 'orjson' codec requires the orjson package")
+
+    def encode(self, event: "BaseEvent") -> bytes:
+        # JSON-mode dump stringifies in pydantic-core, avoiding a Python default hook
+        return orjson.dumps(event.model_dump(mode="json"))
+
+    def dumps(self, obj: dict) -> bytes:
+        # orjson handles UUID and datetime natively; HttpUrl falls back to str
+        return orjson.dumps(obj, default=str)
+
+    def loads(self, data: bytes) -> dict:
+        return orjson.loads(data)
+
+
+CODECS: dict[str, type[EventCodec]] = {
+    codec.codec_id: codec for codec in (JsonCodec, OrjsonCodec)
+}
+
+_instances: dict[str, EventCodec] = {}
+
+
+def get_codec(codec_id: str) -> EventCodec:
+    """Return the (cached) codec registered under codec_id."""
+    codec = _instances.get(codec_id)
+    if codec is None:
+        if codec_id not in CODECS:
+            raise ValueError(f"Unknown event codec '{codec_id}'")
+        codec = _instances[codec_id] = CODECS[codec_id]()
+    return codec
+
+
+def register_codec(codec: type[EventCodec]) -> type[EventCodec]:
+    """Register an additional codec class (usable as a decorator)."""
+    CODECS[codec.codec_id] = codec
+    _instances.pop(codec.codec_id, None)
+    return codec
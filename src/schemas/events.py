@@ -4,19 +4,94 @@ Used for event-driven communication between services.
 """
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Any, ClassVar, Literal
 from pydantic import BaseModel, Field
+from src.schemas.codecs import JsonCodec, get_codec
+from src.schemas.subscription import SubscriptionChange
 from src.schemas.video import TikTokVideo
 
+# Kafka header names of the wire envelope
+CODEC_HEADER = "ep-codec"
+SCHEMA_VERSION_HEADER = "ep-schema-version"
+EVENT_NAME_HEADER = "ep-event"
+
+# event_name -> event class, filled in as subclasses are defined
+EVENT_TYPES: dict[str, type["BaseEvent"]] = {}
+
 
 class BaseEvent(BaseModel):
     """
     Base class for all domain events.
     """
+    # Bump when the payload shape changes; see upgrade()
+    schema_version: ClassVar[int] = 1
+
     event_id: UUID = Field(default_factory=uuid4)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     event_name: str
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any):
+        super().__pydantic_init_subclass__(**kwargs)
+        event_name = cls.model_fields["event_name"].default
+        if isinstance(event_name, str):
+            EVENT_TYPES[event_name] = cls
+
+    def encode(self, codec_id: str = JsonCodec.codec_id) -> tuple[bytes, list[tuple[str, bytes]]]:
+        """
+        Serialize the event with the given codec.
+
+        Returns:
+            (payload bytes, Kafka headers describing the envelope)
+        """
+        codec = get_codec(codec_id)
+        headers = [
+            (CODEC_HEADER, codec.codec_id.encode("ascii")),
+            (SCHEMA_VERSION_HEADER, str(self.schema_version).encode("ascii")),
+            (EVENT_NAME_HEADER, self.event_name.encode("utf-8")),
+        ]
+        return codec.encode(self), headers
+
+    @classmethod
+    def decode(cls, data: bytes, headers: Any = None) -> "BaseEvent":
+        """
+        Deserialize a Kafka message value using the codec named in its headers.
+        Messages without headers are treated as plain JSON.
+        Called on BaseEvent, the concrete class is looked up by event name.
+        """
+        meta = {key: value.decode("utf-8") for key, value in headers or ()}
+        codec = get_codec(meta.get(CODEC_HEADER, JsonCodec.codec_id))
+        version = int(meta.get(SCHEMA_VERSION_HEADER, 1))
+
+        event_cls = cls
+        if cls is BaseEvent and EVENT_NAME_HEADER in meta:
+            event_cls = EVENT_TYPES.get(meta[EVENT_NAME_HEADER], cls)
+
+        if event_cls is not BaseEvent and version == event_cls.schema_version:
+            return codec.decode(data, event_cls)
+
+        obj = codec.loads(data)
+        if event_cls is BaseEvent:
+            event_cls = EVENT_TYPES.get(obj.get("event_name"), BaseEvent)
+            if event_cls is BaseEvent:
+                raise ValueError(f"Unknown event type '{obj.get('event_name')}'")
+        return event_cls.model_validate(event_cls.upgrade(obj, version))
+
+    def partition_key(self) -> str | None:
+        """
+        Kafka message key; events sharing a key land on the same partition
+        and are processed in order. None means no ordering requirement.
+        """
+        return None
+
+    @classmethod
+    def upgrade(cls, obj: dict, from_version: int) -> dict:
+        """
+        Migrate a decoded payload written with another schema_version.
+        Subclasses override this when they change their schema.
+        """
+        return obj
+
 
 class VideoFoundEvent(BaseEvent):
     """
@@ -25,3 +100,19 @@ class VideoFoundEvent(BaseEvent):
     """
     event_name: Literal["video.found"] = "video.found"
     payload: TikTokVideo
+
+    def partition_key(self) -> str:
+        # Keep every video of one account on one partition, in order
+        return self.payload.author_username
+
+
+class SubscriptionChangedEvent(BaseEvent):
+    """
+    Event fired by the API when a user subscribes to or unsubscribes from
+    an account. Notifier workers use it to drop cached subscriber lists.
+    """
+    event_name: Literal["subscription.changed"] = "subscription.changed"
+    payload: SubscriptionChange
+
+    def partition_key(self) -> str:
+        return self.payload.account_username
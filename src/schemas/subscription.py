@@ -0,0 +1,41 @@
+"""
+Subscription Pydantic schemas.
+DTOs for subscribing users to monitored accounts.
+"""
+import uuid
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, Field, field_validator
+
+
+class SubscriptionCreate(BaseModel):
+    """Schema for subscribing a user to a monitored account."""
+    username: str = Field(..., min_length=1, description="TikTok username to follow")
+    keywords: list[str] = Field(
+        default_factory=list,
+        max_length=100,
+        description="Only notify for captions containing one of these keywords/hashtags as a whole word (case-insensitive); empty = all videos",
+    )
+
+    @field_validator("keywords")
+    @classmethod
+    def clean_keywords(cls, keywords: list[str]) -> list[str]:
+        return list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+
+
+class SubscriptionRead(BaseModel):
+    """Schema for reading a subscription."""
+    user_id: uuid.UUID
+    account_id: uuid.UUID
+    username: str
+    keywords: list[str] = []
+    created_at: datetime
+
+
+class SubscriptionChange(BaseModel):
+    """Payload of a subscription.changed event."""
+    user_id: uuid.UUID
+    account_id: uuid.UUID
+    account_username: str
+    action: Literal["subscribed", "updated", "unsubscribed"]
+    changed_at: datetime
@@ -0,0 +1,184 @@
+"""
+Digest Scheduler - coalesces a user's notifications into one email.
+Notifications are buffered per user in pending_notifications and mailed as a
+single digest when the user's window closes or enough videos piled up.
+A min-heap keyed by flush deadline decides which users are due next.
+"""
+import asyncio
+import heapq
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from typing import Iterable, Sequence
+
+from src.core.config import settings
+from src.core.db import AsyncSessionLocal
+from src.core.metrics import metrics
+from src.models.pending_notification import PendingNotificationModel
+from src.repositories.pending_notification import PendingNotificationRepository
+from src.schemas.events import VideoFoundEvent
+from src.services.email_delivery import DeliveryEngine
+
+# Users flushed per DB round trip / send_many() call
+FLUSH_BATCH_SIZE = 500
+
+
+def build_digest(rows: Sequence[PendingNotificationModel]) -> EmailMessage:
+    """Compose one email listing every buffered video of a user."""
+    authors = list(dict.fromkeys(f"@{row.author_username}" for row in rows))
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = rows[0].email
+    if len(rows) == 1:
+        message["Subject"] = f"New TikTok from {authors[0]}!"
+        message.set_content(f"Check it out here -> {rows[0].video_url}")
+    else:
+        message["Subject"] = f"{len(rows)} new TikToks from {', '.join(authors[:3])}" + (
+            f" and {len(authors) - 3} more" if len(authors) > 3 else ""
+        )
+        message.set_content("\n".join(f"@{row.author_username}: {row.video_url}" for row in rows))
+    return message
+
+
+class DigestScheduler:
+    """
+    Per-user coalescing stage in front of the DeliveryEngine.
+
+    The DB rows are the source of truth: a flush deletes (RETURNING) all of
+    a user's pending rows, whichever worker buffered them, so concurrent
+    flushes of one user never send two digests. The heap only schedules;
+    it is rebuilt from the table on start, so pending entries survive
+    restarts.
+    """
+
+    def __init__(
+        self,
+        delivery: DeliveryEngine,
+        window: float = settings.DIGEST_WINDOW_SECONDS,
+        max_items: int = settings.DIGEST_MAX_ITEMS,
+    ):
+        self.delivery = delivery
+        self.window = window
+        self.max_items = max_items
+        self._heap: list[tuple[float, uuid.UUID]] = []
+        # Current deadline / buffered count per user; heap items whose
+        # deadline no longer matches are stale and skipped
+        self._deadlines: dict[uuid.UUID, float] = {}
+        self._counts: dict[uuid.UUID, int] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        self.buffered = metrics.counter("digest.buffered")
+        self.digests = metrics.counter("digest.sent")
+        self.saved = metrics.counter("digest.emails_saved")
+        metrics.gauge("digest.pending_users", lambda: len(self._deadlines))
+
+    async def start(self):
+        """Reload pending entries left by previous runs and start flushing."""
+        async with AsyncSessionLocal() as session:
+            for user_id, flush_at, count in await PendingNotificationRepository(session).pending_users():
+                self._schedule(user_id, flush_at.timestamp(), count)
+        if self._deadlines:
+            print(f"📬 Digest: resumed {len(self._deadlines)} users with pending notifications")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop flushing; pending rows stay in the DB for the next start."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def enqueue(
+        self, repo: PendingNotificationRepository, items: Sequence[tuple[object, VideoFoundEvent]]
+    ) -> list[tuple[uuid.UUID, float, int]]:
+        """
+        Buffer (user, event) notifications in the caller's transaction.
+        Returns the (user_id, deadline, count) entries to pass to schedule()
+        once that transaction committed: a flush running before the commit
+        would find none of the rows, and nothing would be left scheduled.
+        """
+        now = time.time()
+        rows, deadlines, added = [], {}, defaultdict(int)
+        for user, event in items:
+            deadline = deadlines.setdefault(user.id, self._deadlines.get(user.id, now + self.window))
+            video = event.payload
+            rows.append(dict(
+                user_id=user.id,
+                email=user.email,
+                event_id=event.event_id,
+                author_username=video.author_username,
+                platform_id=video.platform_id,
+                video_url=str(video.video_url),
+                flush_at=datetime.fromtimestamp(deadline, timezone.utc),
+            ))
+            added[user.id] += 1
+
+        await repo.add_many(rows)
+        self.buffered.inc(len(rows))
+        return [(user_id, deadlines[user_id], count) for user_id, count in added.items()]
+
+    def schedule(self, entries: Iterable[tuple[uuid.UUID, float, int]]):
+        """Schedule the flushes of rows returned by enqueue() after they were committed."""
+        for user_id, deadline, count in entries:
+            self._schedule(user_id, deadline, count)
+
+    def _schedule(self, user_id: uuid.UUID, deadline: float, added: int):
+        count = self._counts[user_id] = self._counts.get(user_id, 0) + added
+        if count >= self.max_items:
+            deadline = min(deadline, time.time())
+
+        current = self._deadlines.get(user_id)
+        if current is not None and current <= deadline:
+            return
+        self._deadlines[user_id] = deadline
+        heapq.heappush(self._heap, (deadline, user_id))
+        if self._heap[0][1] == user_id:
+            self._wakeup.set()
+
+    def _pop_due(self, now: float) -> list[uuid.UUID]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < FLUSH_BATCH_SIZE:
+            deadline, user_id = heapq.heappop(self._heap)
+            if self._deadlines.get(user_id) == deadline:
+                del self._deadlines[user_id]
+                self._counts.pop(user_id, None)
+                due.append(user_id)
+        return due
+
+    async def _run(self):
+        while True:
+            due = self._pop_due(time.time())
+            if due:
+                try:
+                    await self._flush(due)
+                except Exception as e:
+                    print(f"❌ Digest flush of {len(due)} users failed, retrying later: {e}")
+                    retry_at = time.time() + max(self.window, 1.0)
+                    for user_id in due:
+                        self._schedule(user_id, retry_at, 0)
+                continue
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    async def _flush(self, user_ids: list[uuid.UUID]):
+        """Send one digest per user; the rows are deleted once it went out."""
+        async with AsyncSessionLocal() as session:
+            rows = await PendingNotificationRepository(session).take_for_users(user_ids)
+
+            by_user: dict[uuid.UUID, list[PendingNotificationModel]] = defaultdict(list)
+            for row in rows:
+                by_user[row.user_id].append(row)
+
+            if by_user:
+                await self.delivery.send_many(build_digest(user_rows) for user_rows in by_user.values())
+                self.digests.inc(len(by_user))
+                self.saved.inc(len(rows) - len(by_user))
+            await session.commit()
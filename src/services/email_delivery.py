@@ -0,0 +1,593 @@
+"""
+Email Delivery - sends notification emails with bounded concurrency.
+A fixed set of sender tasks drains a queue of messages through a backend;
+the SMTP backend keeps a pool of persistent connections and pipelines
+batches of messages over each, so a message costs one round trip instead
+of a TCP/TLS handshake plus login and four command round trips.
+Optional token-bucket limits keep fan-outs within provider send quotas.
+"""
+import abc
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.utils import parseaddr
+from typing import AsyncIterable, Collection, Iterable
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.utils.aiter_any import aiter_any
+from src.utils.token_bucket import TokenBuckets
+
+try:
+    import aiosmtplib
+    from aiosmtplib.email import extract_recipients, extract_sender, flatten_message
+except ImportError:  # pragma: no cover - optional dependency
+    aiosmtplib = None
+
+# Body encoding for DATA: CRLF line endings, leading dots doubled (RFC 5321)
+_LINE_ENDINGS = re.compile(rb"\r\n|\n|\r(?!\n)")
+_PERIOD = re.compile(rb"(?m)^\.")
+
+
+class PermanentDeliveryError(Exception):
+    """The server rejected the message for good (5xx); retrying is pointless."""
+
+
+class EmailBackend(abc.ABC):
+    """
+    Base class for email transports.
+    send() raises on failure; PermanentDeliveryError means do not retry.
+    """
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abc.abstractmethod
+    async def send(self, message: EmailMessage):
+        """Deliver one message."""
+
+
+class ConsoleBackend(EmailBackend):
+    """Prints emails instead of sending them (development default)."""
+
+    async def send(self, message: EmailMessage):
+        print("  --------------------------------------------------")
+        print(f"  📧 TO: {message['To']}")
+        print(f"  SUBJECT: {message['Subject']}")
+        print(f"  BODY: {message.get_content().strip()}")
+        print("  --------------------------------------------------")
+
+
+class _SmtpConnection:
+    """
+    One SMTP session, sending batches of messages.
+
+    When the server advertises PIPELINING (RFC 2920), each message's MAIL,
+    RCPT and DATA commands go out in one write and its body goes out
+    together with the next message's envelope, so a message costs one
+    round trip instead of four. aiosmtplib reads a single reply per command,
+    so after its EHLO / STARTTLS / AUTH handshake the transport is handed to
+    a plain StreamReader that can buffer several replies. Without
+    PIPELINING the batch is sent one message at a time through aiosmtplib.
+    """
+    def __init__(self, smtp, timeout: float):
+        self.smtp = smtp
+        self.timeout = timeout
+        self.uses = 0
+        self.broken = False
+        self.utf8 = smtp.supports_extension("smtputf8")
+        self.cte_type = "8bit" if smtp.supports_extension("8bitmime") else "7bit"
+        self.reader = self.writer = None
+        if smtp.supports_extension("pipelining"):
+            loop = asyncio.get_running_loop()
+            transport = smtp.transport
+            self.reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(self.reader)
+            transport.set_protocol(protocol)
+            protocol.connection_made(transport)
+            self.writer = asyncio.StreamWriter(transport, protocol, self.reader, loop)
+
+    @property
+    def is_connected(self) -> bool:
+        if self.broken:
+            return False
+        if self.writer is not None:
+            return not self.writer.is_closing()
+        return self.smtp.is_connected
+
+    async def close(self):
+        try:
+            if self.writer is None:
+                await self.smtp.quit()
+            else:
+                self.writer.write(b"QUIT\r\n")
+                await asyncio.wait_for(self._reply(), self.timeout)
+        except Exception:
+            pass
+        finally:
+            if self.writer is None:
+                self.smtp.close()
+            else:
+                self.writer.close()
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[Exception | None]:
+        """
+        Send messages in order; returns None or the error per message.
+        SMTP replies leave the connection usable; any other error marks it
+        broken and is reported for every message not confirmed yet.
+        """
+        results: list[Exception | None] = []
+        try:
+            if self.writer is None:
+                for message in messages:
+                    try:
+                        await self.smtp.send_message(message)
+                        results.append(None)
+                    except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused) as e:
+                        results.append(e)
+            else:
+                await self._send_pipelined(messages, results)
+        except Exception as e:
+            self.broken = True
+            results.extend([e] * (len(messages) - len(results)))
+        self.uses += len(messages)
+        return results
+
+    def _envelope(self, message: EmailMessage) -> tuple[bytes, str, list[str], bytes]:
+        """(MAIL / RCPT / DATA commands, sender, recipients, dot-stuffed body)."""
+        sender = extract_sender(message) or ""
+        recipients = extract_recipients(message)
+        if not recipients:
+            raise ValueError("Message has no recipients")
+        addresses = [sender, *recipients]
+        utf8 = self.utf8 and not all(address.isascii() for address in addresses)
+        option = b" SMTPUTF8" if utf8 else b""
+        commands = b"MAIL FROM:<%s>%s\r\n" % (sender.encode("utf-8"), option)
+        commands += b"".join(b"RCPT TO:<%s>\r\n" % recipient.encode("utf-8") for recipient in recipients)
+        commands += b"DATA\r\n"
+
+        body = flatten_message(message, utf8=utf8, cte_type=self.cte_type)
+        body = _PERIOD.sub(b"..", _LINE_ENDINGS.sub(b"\r\n", body))
+        if not body.endswith(b"\r\n"):
+            body += b"\r\n"
+        return commands, sender, recipients, body + b".\r\n"
+
+    async def _reply(self) -> tuple[int, str]:
+        lines = []
+        while True:
+            line = await self.reader.readline()
+            if not line.endswith(b"\n"):
+                raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+            lines.append(line[4:].strip().decode("utf-8", "replace"))
+            if line[3:4] != b"-":
+                return int(line[:3]), "\n".join(lines)
+
+    async def _send_pipelined(self, messages: list[EmailMessage], results: list):
+        envelopes = []
+        for message in messages:
+            try:
+                envelopes.append(self._envelope(message))
+            except ValueError as e:
+                envelopes.append(e)
+        valid = [i for i, envelope in enumerate(envelopes) if not isinstance(envelope, Exception)]
+        # The next message's MAIL / RCPT / DATA ride along with this one's body
+        following = dict(zip(valid, [envelopes[i][0] for i in valid[1:]]))
+
+        async def reply():
+            return await asyncio.wait_for(self._reply(), self.timeout)
+
+        if valid:
+            self.writer.write(envelopes[valid[0]][0])
+        for i, envelope in enumerate(envelopes):
+            if isinstance(envelope, Exception):
+                results.append(envelope)
+                continue
+            _, sender, recipients, body = envelope
+            next_commands = following.get(i, b"")
+
+            code, text = await reply()
+            error = aiosmtplib.SMTPSenderRefused(code, text, sender) if code != 250 else None
+            refused = []
+            for recipient in recipients:
+                code, text = await reply()
+                if code not in (250, 251):
+                    refused.append(aiosmtplib.SMTPRecipientRefused(code, text, recipient))
+            if error is None and len(refused) == len(recipients):
+                error = aiosmtplib.SMTPRecipientsRefused(refused)
+
+            code, text = await reply()
+            if code != 354:
+                # Clear the half-open transaction before the next MAIL
+                results.append(error or aiosmtplib.SMTPDataError(code, text))
+                self.writer.write(b"RSET\r\n" + next_commands)
+                await reply()
+                continue
+            # 354 despite a rejected MAIL: end the transaction with no content
+            self.writer.write((body if error is None else b".\r\n") + next_commands)
+            code, text = await reply()
+            if error is None and code != 250:
+                error = aiosmtplib.SMTPDataError(code, text)
+            results.append(error)
+        await self.writer.drain()
+
+
+class SmtpBackend(EmailBackend):
+    """
+    SMTP transport over a pool of persistent aiosmtplib connections.
+
+    send() queues the message; pool_size connection tasks each take up to
+    pipeline_depth queued messages at a time and send them back to back
+    over their connection, pipelined when the server supports it.
+    Connections are opened lazily, recycled after
+    max_messages_per_connection, and dropped on any connection-level error
+    (a fresh one is opened for the next batch).
+    """
+    def __init__(
+        self,
+        hostname: str = settings.SMTP_HOST,
+        port: int = settings.SMTP_PORT,
+        username: str | None = settings.SMTP_USERNAME,
+        password: str | None = settings.SMTP_PASSWORD,
+        use_tls: bool = settings.SMTP_USE_TLS,
+        start_tls: bool = settings.SMTP_START_TLS,
+        pool_size: int = settings.SMTP_POOL_SIZE,
+        timeout: float = settings.SMTP_TIMEOUT_SECONDS,
+        max_messages_per_connection: int = settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+        pipeline_depth: int = settings.SMTP_PIPELINE_DEPTH,
+    ):
+        if aiosmtplib is None:
+            raise RuntimeError("The 'smtp' email backend requires the aiosmtplib package")
+        self.options = dict(
+            hostname=hostname, port=port, username=username, password=password,
+            use_tls=use_tls, start_tls=start_tls, timeout=timeout,
+        )
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.pipeline_depth = max(pipeline_depth, 1)
+        self._pending: asyncio.Queue[tuple[EmailMessage, asyncio.Future]] = asyncio.Queue()
+        self._connections: list[asyncio.Task] = []
+
+        self.batch_size = metrics.summary("smtp.batch_size")
+
+    async def start(self):
+        if not self._connections:
+            self._connections = [asyncio.create_task(self._connection_loop()) for _ in range(self.pool_size)]
+
+    async def stop(self):
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        self._connections = []
+
+    async def send(self, message: EmailMessage):
+        if not self._connections:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait((message, future))
+        await future
+
+    async def _connect(self) -> _SmtpConnection:
+        smtp = aiosmtplib.SMTP(**self.options)
+        await smtp.connect()
+        # connect() only greets when TLS or login needs it; the extensions
+        # (PIPELINING, 8BITMIME, SMTPUTF8) are needed up front here
+        if smtp.is_ehlo_or_helo_needed:
+            try:
+                await smtp.ehlo()
+            except aiosmtplib.SMTPHeloError:
+                await smtp.helo()
+        return _SmtpConnection(smtp, self.timeout)
+
+    async def _take_batch(self) -> list[tuple[EmailMessage, asyncio.Future]]:
+        batch = [await self._pending.get()]
+        while len(batch) < self.pipeline_depth and not self._pending.empty():
+            batch.append(self._pending.get_nowait())
+        # Skip messages whose sender gave up waiting
+        return [item for item in batch if not item[1].done()]
+
+    async def _connection_loop(self):
+        connection = None
+        batch = []
+        try:
+            while True:
+                batch = await self._take_batch()
+                if not batch:
+                    continue
+                self.batch_size.observe(len(batch))
+                try:
+                    if connection is None or not connection.is_connected:
+                        connection = await self._connect()
+                    results = await connection.send_batch([message for message, _ in batch])
+                except Exception as e:
+                    results = [e] * len(batch)
+                for (_, future), result in zip(batch, results):
+                    _settle(future, result)
+                batch = []
+
+                if connection is not None and (
+                    not connection.is_connected or connection.uses >= self.max_messages_per_connection
+                ):
+                    await connection.close()
+                    connection = None
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(aiosmtplib.SMTPServerDisconnected("Email backend stopped"))
+            if connection is not None:
+                await connection.close()
+
+
+def _settle(future: asyncio.Future, result: Exception | None):
+    """Complete a send() with its outcome; 5xx replies become PermanentDeliveryError."""
+    if future.done():
+        return
+    if result is None:
+        future.set_result(None)
+    elif isinstance(result, (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)):
+        codes = [r.code for r in getattr(result, "recipients", ())] or [getattr(result, "code", 0)]
+        error = PermanentDeliveryError(str(result)) if min(codes) >= 500 else result
+        if error is not result:
+            error.__cause__ = result
+        future.set_exception(error)
+    else:
+        future.set_exception(result)
+
+
+EMAIL_BACKENDS: dict[str, type[EmailBackend]] = {
+    "console": ConsoleBackend,
+    "smtp": SmtpBackend,
+}
+
+
+def get_email_backend(name: str = settings.EMAIL_BACKEND) -> EmailBackend:
+    if name not in EMAIL_BACKENDS:
+        raise ValueError(f"Unknown email backend '{name}'")
+    return EMAIL_BACKENDS[name]()
+
+
+class SendRateLimiter:
+    """
+    Global, per recipient domain and per recipient address token buckets.
+
+    reserve() takes a token from every bucket when all of them have one.
+    Otherwise only the bucket that imposes the longest wait books its slot
+    ahead, and the caller asks again at that time for the others, passing
+    the scopes it already holds. A backlog for one throttled domain is thus
+    spread over that domain's future slots without eating into the global
+    or per-user budget of mail that could go out now.
+    """
+    SCOPES = ("global", "domain", "user")
+
+    def __init__(
+        self,
+        global_rate: float = settings.EMAIL_RATE_GLOBAL_PER_SECOND,
+        global_burst: int = settings.EMAIL_RATE_GLOBAL_BURST,
+        domain_rate: float = settings.EMAIL_RATE_DOMAIN_PER_SECOND,
+        domain_burst: int = settings.EMAIL_RATE_DOMAIN_BURST,
+        user_rate: float = settings.EMAIL_RATE_USER_PER_SECOND,
+        user_burst: int = settings.EMAIL_RATE_USER_BURST,
+    ):
+        self.buckets = {
+            "global": TokenBuckets(global_rate, global_burst),
+            "domain": TokenBuckets(domain_rate, domain_burst),
+            "user": TokenBuckets(user_rate, user_burst),
+        }
+        self.limited = {scope: metrics.counter(f"ratelimit.{scope}.limited") for scope in self.SCOPES}
+        self.delay_ms = metrics.summary("ratelimit.delay_ms")
+        metrics.gauge("ratelimit.global.tokens", lambda: round(self.buckets["global"].tokens(None), 1))
+        for scope in ("domain", "user"):
+            metrics.gauge(f"ratelimit.{scope}.keys", self.buckets[scope].__len__)
+            metrics.gauge(f"ratelimit.{scope}.throttled", self.buckets[scope].throttled)
+
+    @property
+    def enabled(self) -> bool:
+        return any(bucket.enabled for bucket in self.buckets.values())
+
+    def reserve(self, recipient: str, held: Collection[str] = ()) -> tuple[float, str | None]:
+        """
+        Ask for a send slot; `held` are scopes whose token was booked earlier.
+        Returns (0, None) once every token is taken, else (seconds to wait,
+        scope whose slot was booked) and nothing else is taken yet.
+        """
+        address = parseaddr(recipient)[1].lower() or recipient
+        keys = {"global": None, "domain": address.rpartition("@")[2], "user": address}
+        keys = {scope: key for scope, key in keys.items() if scope not in held}
+        if not keys:
+            return 0.0, None
+        now = time.monotonic()
+
+        delay, scope = max((self.buckets[scope].wait_time(key, now), scope) for scope, key in keys.items())
+        if delay > 0:
+            self.buckets[scope].consume(keys[scope], now)
+            self.limited[scope].inc()
+            self.delay_ms.observe(delay * 1000)
+            return delay, scope
+        for name, key in keys.items():
+            self.buckets[name].consume(key, now)
+        return 0.0, None
+
+
+@dataclass
+class DeliveryReport:
+    """Outcome of one send_many() call."""
+    sent: int = 0
+    failed: list[str] = field(default_factory=list)
+    # Messages not finished yet, plus one while send_many() is still queueing
+    _pending: int = field(default=1, repr=False)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def _finish_one(self, ok: bool, recipient: str):
+        if ok:
+            self.sent += 1
+        else:
+            self.failed.append(recipient)
+        self._release()
+
+    def _release(self):
+        self._pending -= 1
+        if self._pending == 0:
+            self._done.set()
+
+
+@dataclass
+class _Job:
+    message: EmailMessage
+    report: DeliveryReport
+    recipient: str
+    attempt: int = 1
+    # Rate limiter scopes whose slot the job booked for its next attempt
+    held: set[str] = field(default_factory=set)
+
+
+class DeliveryEngine:
+    """
+    Concurrent, retrying email sender shared by a whole worker process.
+
+    `concurrency` sender tasks pull from a bounded queue, so at most that
+    many sends are in flight and producers wait when the queue is full.
+    A failed message is re-queued after an exponential backoff, and a
+    rate-limited one is parked until its reserved slot: both wait in a
+    single deadline heap, so the sender moves on meanwhile and one slow,
+    failing or throttled recipient never holds up the others.
+    """
+    def __init__(
+        self,
+        backend: EmailBackend,
+        concurrency: int = settings.EMAIL_CONCURRENCY,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        retry_backoff: float = settings.EMAIL_RETRY_BACKOFF_SECONDS,
+        limiter: SendRateLimiter | None = None,
+    ):
+        self.backend = backend
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.limiter = limiter if limiter is not None and limiter.enabled else None
+        # send_many() stops queueing while this many jobs are parked
+        self.max_deferred = concurrency * 100
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._senders: list[asyncio.Task] = []
+        self._scheduler: asyncio.Task | None = None
+        # (due monotonic time, tiebreak, job) of parked retries / rate-limited sends
+        self._deferred: list[tuple[float, int, _Job]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._room = asyncio.Event()
+        self._outstanding = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+        self.sent = metrics.counter("email.sent")
+        self.failed = metrics.counter("email.failed")
+        self.retried = metrics.counter("email.retried")
+        self.send_ms = metrics.summary("email.send_ms")
+        metrics.gauge("email.deferred", lambda: len(self._deferred))
+
+    async def start(self):
+        await self.backend.start()
+        self._queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        self._senders = [asyncio.create_task(self._sender()) for _ in range(self.concurrency)]
+        self._scheduler = asyncio.create_task(self._release_deferred())
+
+    async def stop(self):
+        """Finish queued and parked messages, then close the backend."""
+        if self._queue is not None:
+            await self._drained.wait()
+            for task in (*self._senders, self._scheduler):
+                task.cancel()
+            await asyncio.gather(*self._senders, self._scheduler, return_exceptions=True)
+            self._queue = None
+        await self.backend.stop()
+
+    async def send_many(self, messages: Iterable[EmailMessage] | AsyncIterable[EmailMessage]) -> DeliveryReport:
+        """
+        Queue messages and wait until each was sent or gave up.
+        Waits for queue space as it goes, so huge fan-outs (e.g. a streamed
+        async iterable) stay bounded in memory and start sending at once.
+        """
+        if self._queue is None:
+            raise RuntimeError("DeliveryEngine not started!")
+
+        report = DeliveryReport()
+        async for message in aiter_any(messages):
+            while len(self._deferred) >= self.max_deferred:
+                self._room.clear()
+                await self._room.wait()
+            report._pending += 1
+            self._outstanding += 1
+            self._drained.clear()
+            await self._queue.put(_Job(message, report, message["To"]))
+        report._release()
+
+        await report._done.wait()
+        return report
+
+    async def _sender(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._attempt(job)
+            finally:
+                self._queue.task_done()
+
+    async def _attempt(self, job: _Job):
+        if self.limiter is not None:
+            delay, scope = self.limiter.reserve(job.recipient, job.held)
+            if delay > 0:
+                job.held.add(scope)
+                self._defer(job, delay)
+                return
+            job.held.clear()
+
+        start = time.perf_counter()
+        try:
+            await self.backend.send(job.message)
+        except Exception as e:
+            if isinstance(e, PermanentDeliveryError) or job.attempt >= self.max_attempts:
+                print(f"❌ Email to {job.recipient} failed after {job.attempt} attempt(s): {e}")
+                self.failed.inc()
+                self._finish(job, False)
+                return
+            self.retried.inc()
+            delay = self.retry_backoff * 2 ** (job.attempt - 1)
+            job.attempt += 1
+            self._defer(job, delay)
+            return
+
+        self.send_ms.observe((time.perf_counter() - start) * 1000)
+        self.sent.inc()
+        self._finish(job, True)
+
+    def _finish(self, job: _Job, ok: bool):
+        job.report._finish_one(ok, job.recipient)
+        self._outstanding -= 1
+        if self._outstanding == 0:
+            self._drained.set()
+
+    def _defer(self, job: _Job, delay: float):
+        heapq.heappush(self._deferred, (time.monotonic() + delay, next(self._seq), job))
+        if self._deferred[0][2] is job:
+            self._wakeup.set()
+
+    async def _release_deferred(self):
+        """Move parked jobs back onto the queue as they fall due."""
+        while True:
+            while self._deferred and self._deferred[0][0] <= time.monotonic():
+                _, _, job = heapq.heappop(self._deferred)
+                await self._queue.put(job)
+                if len(self._deferred) < self.max_deferred:
+                    self._room.set()
+
+            self._wakeup.clear()
+            timeout = self._deferred[0][0] - time.monotonic() if self._deferred else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
@@ -0,0 +1,96 @@
+"""
+Idempotency Guard - drops redelivered events before they are handled again.
+An in-process LRU/TTL cache answers most duplicate checks in memory; the
+processed_events table is the durable source of truth behind it. Events
+are claimed there before they are handled, so only one delivery sends.
+"""
+from typing import Sequence, TypeVar
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.repositories.processed_event import ProcessedEventRepository
+from src.schemas.events import BaseEvent
+from src.utils.ttl_cache import TTLCache
+
+E = TypeVar("E", bound=BaseEvent)
+
+
+class IdempotencyGuard:
+    """
+    Event-id dedup for at-least-once consumers.
+    One instance per worker process; repositories are passed per call
+    so every event batch keeps using its own DB session.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.IDEMPOTENCY_CACHE_SIZE,
+        ttl: float = settings.IDEMPOTENCY_CACHE_TTL_SECONDS,
+        claim_seconds: float = settings.IDEMPOTENCY_CLAIM_SECONDS,
+    ):
+        self.cache: TTLCache = TTLCache(maxsize, ttl)
+        self.claim_seconds = claim_seconds
+        self.hits = metrics.counter("idempotency.cache_hits")
+        self.misses = metrics.counter("idempotency.cache_misses")
+        self.db_duplicates = metrics.counter("idempotency.db_duplicates")
+        metrics.gauge("idempotency.cache_size", lambda: len(self.cache))
+
+    def seen_recently(self, event: BaseEvent) -> bool:
+        """Memory-only check; True means a known duplicate."""
+        if event.event_id in self.cache:
+            self.hits.inc()
+            return True
+        return False
+
+    async def claim(self, repo: ProcessedEventRepository, events: Sequence[E]) -> list[E]:
+        """
+        Claim the events this worker should handle and commit the claim
+        before anything is sent, so a concurrent delivery of the same event
+        gets nothing back. Returns the claimed events, in order.
+        Unclaimed events are not cached: their claimer may still release them.
+        """
+        unknown, seen = [], set()
+        for event in events:
+            if not self.seen_recently(event) and event.event_id not in seen:
+                seen.add(event.event_id)
+                unknown.append(event)
+        if not unknown:
+            return []
+
+        self.misses.inc(len(unknown))
+        claimed = await repo.claim(unknown, self.claim_seconds)
+        await repo.commit(repo.db)
+        self.db_duplicates.inc(len(unknown) - len(claimed))
+        return [event for event in unknown if event.event_id in claimed]
+
+    async def release(
+        self, repo: ProcessedEventRepository, events: Sequence[BaseEvent], handled: Sequence[BaseEvent] = ()
+    ):
+        """
+        Give up claims after handling failed, so the retry sends again.
+        Events in handled had their emails sent before the failure: they
+        are marked processed instead, so the retry skips them. If this
+        fails too, the claims expire after IDEMPOTENCY_CLAIM_SECONDS.
+        """
+        done = {event.event_id for event in handled}
+        try:
+            await repo.db.rollback()
+            if handled:
+                await repo.mark_processed(handled)
+            await repo.release(event.event_id for event in events if event.event_id not in done)
+            await repo.commit(repo.db)
+        except Exception as e:
+            print(f"❌ Releasing {len(events)} claimed event(s) failed, they retry once it expires: {e}")
+            return
+        for event_id in done:
+            self.cache.put(event_id, True)
+
+    async def mark_processed(self, repo: ProcessedEventRepository, events: Sequence[BaseEvent]):
+        """
+        Record handled events in the DB (bulk, conflict-tolerant) and commit;
+        they only enter the cache once the commit succeeded.
+        """
+        await repo.mark_processed(events)
+        await repo.commit(repo.db)
+        for event in events:
+            self.cache.put(event.event_id, True)
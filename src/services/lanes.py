@@ -0,0 +1,89 @@
+"""
+Priority Lanes - routes video.found events by audience size.
+Events of accounts with a large audience go to video.found.bulk, all others
+to video.found.fast, so one mega-account fan-out holding a partition never
+delays small accounts' notifications. Each lane has its own consumer pool.
+"""
+from typing import Iterable
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.repositories.subscription import SubscriptionRepository
+from src.utils.ttl_cache import TTLCache
+
+VIDEO_FOUND_TOPIC = "video.found"
+FAST_LANE = "fast"
+BULK_LANE = "bulk"
+
+
+def lane_topic(lane: str) -> str:
+    return f"{VIDEO_FOUND_TOPIC}.{lane}"
+
+
+def parse_lanes(raw: str) -> list[str]:
+    """Parse "fast,bulk" into ["fast", "bulk"]."""
+    return list(dict.fromkeys(lane for lane in raw.replace(" ", "").split(",") if lane))
+
+
+def parse_lane_concurrency(raw: str) -> dict[str, int]:
+    """Parse "fast:16,bulk:2" into {"fast": 16, "bulk": 2}."""
+    concurrency = {}
+    for item in raw.replace(" ", "").split(","):
+        if item:
+            lane, _, value = item.partition(":")
+            concurrency[lane] = int(value)
+    return concurrency
+
+
+class LaneRouter:
+    """
+    Picks the lane of an account from its subscriber count.
+
+    Counts are cached per process for `ttl` seconds: an account crossing
+    the threshold switches lanes a little late, which only affects which
+    pool handles it, never whether it is notified.
+    """
+    def __init__(
+        self,
+        bulk_min_subscribers: int = settings.LANE_BULK_MIN_SUBSCRIBERS,
+        max_entries: int = settings.LANE_COUNT_CACHE_SIZE,
+        ttl: float = settings.LANE_COUNT_TTL_SECONDS,
+    ):
+        self.bulk_min_subscribers = bulk_min_subscribers
+        self._counts: TTLCache[str, int] = TTLCache(max_entries, ttl)
+
+        self.hits = metrics.counter("lanes.count_hits")
+        self.misses = metrics.counter("lanes.count_misses")
+        self.routed = {lane: metrics.counter(f"lanes.{lane}") for lane in (FAST_LANE, BULK_LANE)}
+
+    async def topic_for(self, repo: SubscriptionRepository, username: str) -> str:
+        return (await self.topics_for(repo, [username]))[username]
+
+    async def topics_for(self, repo: SubscriptionRepository, usernames: Iterable[str]) -> dict[str, str]:
+        """Lane topic per username; uncached counts are fetched in one query."""
+        usernames = list(dict.fromkeys(usernames))
+        counts = {}
+        for username in usernames:
+            count = self._counts.get(username)
+            if count is not None:
+                counts[username] = count
+
+        missing = [username for username in usernames if username not in counts]
+        self.hits.inc(len(counts))
+        if missing:
+            self.misses.inc(len(missing))
+            loaded = await repo.count_subscribers(missing)
+            for username in missing:
+                counts[username] = loaded.get(username, 0)
+                self._counts.put(username, counts[username])
+
+        topics = {}
+        for username, count in counts.items():
+            lane = BULK_LANE if count >= self.bulk_min_subscribers else FAST_LANE
+            self.routed[lane].inc()
+            topics[username] = lane_topic(lane)
+        return topics
+
+
+# Shared by every publisher in the process
+lane_router = LaneRouter()
@@ -2,8 +2,21 @@
 Notifier Service - Business logic for sending notifications.
 Implements the Fan-Out pattern for user notifications when new videos are found.
 """
+import asyncio
+from email.message import EmailMessage
+from typing import AsyncIterable, Iterable
+
+from src.core.config import settings
 from src.schemas.events import VideoFoundEvent
 from src.repositories.subscription import SubscriptionRepository
+from src.repositories.notification_delivery import NotificationDeliveryRepository
+from src.repositories.pending_notification import PendingNotificationRepository
+from src.services.digest import DigestScheduler
+from src.services.email_delivery import ConsoleBackend, DeliveryEngine, DeliveryReport
+from src.services.subscriber_cache import STREAMED, AccountSubscribers, SubscriberCache
+from src.utils.aiter_any import aiter_any
+
+_console = ConsoleBackend()
 
 
 class NotifierService:
@@ -12,35 +25,181 @@ class NotifierService:
     Sends notifications to subscribed users when new videos are discovered.
     """
     
-    def __init__(self, user_subcription_repo: SubscriptionRepository):
+    def __init__(
+        self,
+        user_subcription_repo: SubscriptionRepository,
+        subscriber_cache: SubscriberCache | None = None,
+        delivery: DeliveryEngine | None = None,
+        progress_repo: NotificationDeliveryRepository | None = None,
+        digest: DigestScheduler | None = None,
+        pending_repo: PendingNotificationRepository | None = None
+    ):
         self.user_subcription_repo = user_subcription_repo
+        # Optional process-wide cache and email engine shared by every event (worker only)
+        self.subscriber_cache = subscriber_cache
+        self.delivery = delivery
+        # Checkpoints of streamed fan-outs; without it they restart from scratch
+        self.progress_repo = progress_repo
+        # Coalesces per-user notifications into digests when both are given
+        self.digest = digest
+        self.pending_repo = pending_repo
+        # Digest flushes to schedule once the caller committed the buffered rows
+        self.digest_schedule: list = []
+        # Events whose emails went out, so a caller can spare them a replay
+        # when a later step of the batch fails
+        self.handled: list[VideoFoundEvent] = []
 
     async def handle_event(self, event: VideoFoundEvent):
         """
         The main handler triggered by the Kafka Consumer.
         Processes VideoFoundEvent and notifies subscribed users.
         """
+        await self.handle_events([event])
 
-        video = event.payload
+    async def handle_events(self, events: list[VideoFoundEvent]):
+        """
+        Batch handler used by the worker's batch mode.
+        Resolves the subscribers of every distinct author in a single query,
+        then hands every email of the batch to the delivery engine at once.
+        Events are added to self.handled as their emails are sent; digested
+        ones are not, their rows only last if the caller commits.
+        """
+        subscribers_by_account = await self.get_subscribers(
+            event.payload.author_username for event in events
+        )
+
+        notifications = []
+        for event in events:
+            video = event.payload
+            print(f"🔔 Processing Notification for Video: {video.platform_id} (@{video.author_username})")
 
-        print(f"🔔 Processing Notification for Video: {video.platform_id} (@{video.author_username})")
+            account_subscribers = subscribers_by_account.get(video.author_username)
+            if account_subscribers is STREAMED:
+                await self.fan_out_streamed(event)
+                self.handled.append(event)
+                continue
 
-        subscribers = await self.user_subcription_repo.get_subscribers_for_account(video.author_username)
+            # Unfiltered subscribers plus those whose keywords occur in the caption
+            subscribers = account_subscribers.matching(video.caption) if account_subscribers else ()
+            if not subscribers:
+                print(f"  🤷 No subscribers found for @{video.author_username}")
+                self.handled.append(event)
+                continue
 
-        if not subscribers:
-            print(f"  🤷 No subscribers found for @{video.author_username}")
+            notifications.extend((user, event) for user in subscribers)
+
+        if not notifications:
             return
+        if self.digest is not None and self.pending_repo is not None:
+            self.digest_schedule.extend(await self.digest.enqueue(self.pending_repo, notifications))
+        else:
+            await self.send_emails(self.build_email(user, event.payload) for user, event in notifications)
+            self.handled.extend({event.event_id: event for _, event in notifications}.values())
+
+    async def get_subscribers(self, usernames):
+        """
+        Subscribers per account username, through the cache when there is one.
+        Accounts above SUBSCRIBER_STREAM_THRESHOLD map to STREAMED instead.
+        """
+        if self.subscriber_cache is None:
+            loaded = await self.load_subscribers(usernames)
+            return {
+                name: rows if rows is STREAMED else AccountSubscribers.from_rows(rows)
+                for name, rows in loaded.items()
+            }
+        return await self.subscriber_cache.get_many(usernames, self.load_subscribers)
+
+    async def load_subscribers(self, usernames):
+        names = list(dict.fromkeys(usernames))
+        counts = await self.user_subcription_repo.count_subscribers(names)
+        large = {name for name, count in counts.items() if count > settings.SUBSCRIBER_STREAM_THRESHOLD}
 
-        for user in subscribers:
-            await self.send_email(user, video)
+        subscribers = await self.user_subcription_repo.get_subscribers_for_accounts(
+            name for name in counts if name not in large
+        )
+        subscribers.update(dict.fromkeys(large, STREAMED))
+        return subscribers
 
-    async def send_email(self, user, video):
+    async def fan_out_streamed(self, event: VideoFoundEvent):
         """
-        Send email notification to a user.
-        In production, this would integrate with an email service.
+        Notify the subscribers of a very large account chunk by chunk, in
+        user-id order. After each chunk is delivered its last user id is
+        checkpointed (and committed), so a redelivered event resumes after
+        the last finished chunk instead of mailing everyone again.
+        The next chunk is read while the current one is being sent.
         """
-        print("  --------------------------------------------------")
-        print(f"  📧 TO: {user.email}")
-        print(f"  SUBJECT: New TikTok from @{video.author_username}!")
-        print(f"  BODY: Check it out here -> {video.video_url}")
-        print("  --------------------------------------------------")
+        video = event.payload
+        progress = await self.progress_repo.get_progress(event.event_id) if self.progress_repo else None
+        if progress is not None and progress.completed_at is not None:
+            print(f"  ⏭️ Fan-out of {event.event_id} already completed ({progress.sent} sent)")
+            return
+
+        after_user_id = progress.last_user_id if progress else None
+        totals = (progress.sent, progress.failed) if progress else (0, 0)
+        if after_user_id is not None:
+            print(f"  ⏯️ Resuming fan-out of {event.event_id} after {totals[0]} emails")
+
+        chunks = self.user_subcription_repo.stream_subscribers(
+            video.author_username, settings.SUBSCRIBER_STREAM_CHUNK_SIZE, after_user_id=after_user_id
+        )
+        sending = None
+        try:
+            async for chunk in chunks:
+                if sending is not None:
+                    totals = await self._checkpoint(event, *sending, totals)
+                subscribers = AccountSubscribers.from_rows(chunk).matching(video.caption)
+                task = asyncio.create_task(self.send_emails([self.build_email(user, video) for user in subscribers]))
+                sending = (task, chunk[-1].id)
+        except BaseException:
+            if sending is not None:
+                sending[0].cancel()
+            raise
+
+        if sending is not None:
+            await self._checkpoint(event, *sending, totals, completed=True)
+        elif self.progress_repo is not None:
+            await self._save_progress(event, after_user_id, totals, completed=True)
+
+    async def _checkpoint(
+        self, event: VideoFoundEvent, task: asyncio.Task, last_user_id, totals: tuple[int, int], completed: bool = False
+    ) -> tuple[int, int]:
+        """Wait for a chunk's delivery and record it; returns the new (sent, failed) totals."""
+        report = await task
+        totals = (totals[0] + report.sent, totals[1] + len(report.failed))
+        if self.progress_repo is not None:
+            await self._save_progress(event, last_user_id, totals, completed)
+        return totals
+
+    async def _save_progress(self, event: VideoFoundEvent, last_user_id, totals: tuple[int, int], completed: bool):
+        await self.progress_repo.save_progress(
+            event.event_id, event.payload.author_username, last_user_id, *totals, completed=completed
+        )
+        await self.progress_repo.commit(self.progress_repo.db)
+
+    def build_email(self, user, video) -> EmailMessage:
+        """Compose the notification email for one subscriber."""
+        message = EmailMessage()
+        message["From"] = settings.EMAIL_FROM
+        message["To"] = user.email
+        message["Subject"] = f"New TikTok from @{video.author_username}!"
+        message.set_content(f"Check it out here -> {video.video_url}")
+        return message
+
+    async def send_emails(
+        self, messages: Iterable[EmailMessage] | AsyncIterable[EmailMessage]
+    ) -> DeliveryReport:
+        """
+        Send the emails concurrently through the delivery engine.
+        Without one (e.g. in the API), they are printed one by one.
+        """
+        if self.delivery is None:
+            report = DeliveryReport()
+            async for message in aiter_any(messages):
+                await _console.send(message)
+                report.sent += 1
+            return report
+
+        report = await self.delivery.send_many(messages)
+        if report.failed:
+            print(f"  ⚠️ {len(report.failed)} of {report.sent + len(report.failed)} emails could not be delivered")
+        return report
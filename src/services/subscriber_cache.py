@@ -0,0 +1,209 @@
+"""
+Subscriber Cache - per-account subscriber lists kept in the notifier worker.
+Popular accounts post many times a day over an unchanged subscriber list,
+so the three-table join only runs when a list is missing, expired or
+invalidated by a subscription.changed event.
+"""
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterable, Mapping, Sequence
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.utils.aho_corasick import AhoCorasick
+from src.utils.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class Subscriber:
+    """Detached snapshot of a subscribed user (safe to share across sessions)."""
+    id: uuid.UUID
+    email: str
+    # Normalized caption filters; empty = every video
+    keywords: tuple[str, ...] = ()
+
+
+def normalize_keyword(text: str) -> str:
+    return text.strip().casefold()
+
+
+@lru_cache(maxsize=1024)
+def compile_keywords(keywords: frozenset[str]) -> AhoCorasick:
+    """
+    Automaton for a set of keywords. Reloading an account whose filters did
+    not change (e.g. after a TTL expiry) reuses the compiled automaton.
+    """
+    return AhoCorasick(sorted(keywords))
+
+
+class AccountSubscribers:
+    """
+    The subscribers of one account plus the keyword automaton of their filters,
+    so matching a caption is one pass whatever the number of filters.
+    """
+    __slots__ = ("subscribers", "_unfiltered", "_by_keyword", "_automaton")
+
+    def __init__(self, subscribers: Sequence[Subscriber]):
+        self.subscribers = tuple(subscribers)
+        self._unfiltered = [s for s in self.subscribers if not s.keywords]
+        self._by_keyword: dict[str, list[int]] = defaultdict(list)
+        for index, subscriber in enumerate(self.subscribers):
+            for keyword in subscriber.keywords:
+                self._by_keyword[keyword].append(index)
+        self._automaton = compile_keywords(frozenset(self._by_keyword)) if self._by_keyword else None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "AccountSubscribers":
+        """Build from (id, email, keywords) rows."""
+        return cls([
+            Subscriber(
+                row.id,
+                row.email,
+                tuple(dict.fromkeys(k for k in map(normalize_keyword, row.keywords or ()) if k)),
+            )
+            for row in rows
+        ])
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
+
+    def __iter__(self):
+        return iter(self.subscribers)
+
+    def matching(self, caption: str) -> list[Subscriber]:
+        """
+        Subscribers to notify for a video with this caption: keywords
+        match whole words (or phrases), so "art" does not match "party".
+        """
+        if self._automaton is None:
+            return self._unfiltered
+        hits = set()
+        for keyword in self._automaton.find_words(caption.casefold()):
+            hits.update(self._by_keyword[keyword])
+        return self._unfiltered + [self.subscribers[index] for index in sorted(hits)]
+
+
+# Stands in for the subscriber list of an account too large to hold in
+# memory; loaders return it and callers then stream the list from the DB
+STREAMED = object()
+
+# Loads {username: [(id, email, keywords), ...] | STREAMED} for the given usernames
+SubscriberLoader = Callable[[list[str]], Awaitable[Mapping[str, Sequence | object]]]
+
+
+def _weigh(subscribers) -> int:
+    return 1 if subscribers is STREAMED else max(len(subscribers), 1)
+
+
+class SubscriberCache:
+    """
+    TTL/LRU cache of subscriber lists (with their compiled keyword
+    automaton) keyed by account username.
+
+    - Bounded by the total number of cached subscribers, not of accounts.
+    - Single-flight: concurrent lookups of an account that is being loaded
+      wait for that load instead of issuing their own query.
+    - invalidate() drops an entry and detaches any load in progress, so a
+      list read before a subscription change is never stored after it.
+    - Very large accounts are cached as the STREAMED marker only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.SUBSCRIBER_CACHE_MAX_ENTRIES,
+        ttl: float = settings.SUBSCRIBER_CACHE_TTL_SECONDS,
+    ):
+        # Empty lists and STREAMED markers still take a slot
+        self.cache: TTLCache[str, AccountSubscribers | object] = TTLCache(
+            max_entries, ttl, weigher=_weigh
+        )
+        self._loading: dict[str, asyncio.Future] = {}
+
+        self.hits = metrics.counter("subscriber_cache.hits")
+        self.misses = metrics.counter("subscriber_cache.misses")
+        self.invalidations = metrics.counter("subscriber_cache.invalidations")
+        self.load_ms = metrics.summary("subscriber_cache.load_ms")
+        metrics.gauge("subscriber_cache.hit_rate", self._hit_rate)
+        metrics.gauge("subscriber_cache.accounts", lambda: len(self.cache))
+        metrics.gauge("subscriber_cache.entries", lambda: self.cache.weight)
+
+    def _hit_rate(self) -> float:
+        lookups = self.hits.value + self.misses.value
+        return round(self.hits.value / lookups, 4) if lookups else 0.0
+
+    async def get_many(
+        self, usernames: Iterable[str], load: SubscriberLoader
+    ) -> dict[str, AccountSubscribers | object]:
+        """
+        Subscribers of every given account.
+        Cache misses not already being loaded are fetched with one load() call.
+        """
+        result: dict[str, AccountSubscribers | object] = {}
+        waiting: dict[str, asyncio.Future] = {}
+        missing: list[str] = []
+
+        for name in dict.fromkeys(usernames):
+            cached = self.cache.get(name)
+            if cached is not None:
+                self.hits.inc()
+                result[name] = cached
+                continue
+            self.misses.inc()
+            if name in self._loading:
+                waiting[name] = self._loading[name]
+            else:
+                missing.append(name)
+
+        if missing:
+            result.update(await self._load(missing, load))
+
+        for name, future in waiting.items():
+            result[name] = await asyncio.shield(future)
+        return result
+
+    async def get(self, username: str, load: SubscriberLoader) -> AccountSubscribers | object:
+        return (await self.get_many([username], load))[username]
+
+    async def _load(self, names: list[str], load: SubscriberLoader) -> dict[str, AccountSubscribers | object]:
+        loop = asyncio.get_running_loop()
+        futures = {name: loop.create_future() for name in names}
+        self._loading.update(futures)
+
+        start = time.perf_counter()
+        try:
+            users_by_name = await load(names)
+        except BaseException as exc:
+            for name, future in futures.items():
+                self._release(name, future)
+                future.set_exception(exc)
+                # Waiters (if any) re-raise it; avoid "exception never retrieved"
+                future.exception()
+            raise
+        self.load_ms.observe((time.perf_counter() - start) * 1000)
+
+        loaded = {}
+        for name, future in futures.items():
+            users = users_by_name.get(name, ())
+            subscribers = users if users is STREAMED else AccountSubscribers.from_rows(users)
+            # Skip storing if invalidate() ran while we were loading
+            if self._release(name, future):
+                self.cache.put(name, subscribers)
+            future.set_result(subscribers)
+            loaded[name] = subscribers
+        return loaded
+
+    def _release(self, name: str, future: asyncio.Future) -> bool:
+        if self._loading.get(name) is future:
+            del self._loading[name]
+            return True
+        return False
+
+    def invalidate(self, username: str):
+        """Forget an account's subscribers (its list changed)."""
+        self.invalidations.inc()
+        self.cache.pop(username)
+        self._loading.pop(username, None)
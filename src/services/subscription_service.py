@@ -0,0 +1,87 @@
+"""
+Subscription Service - Business logic for following monitored accounts.
+Every change is queued as a subscription.changed event in the same
+transaction, so notifier workers can drop their cached subscriber lists.
+"""
+import uuid
+from datetime import datetime, timezone
+
+from src.repositories.account import MonitoredAccountRepository
+from src.repositories.outbox import EventOutboxRepository
+from src.repositories.subscription import SubscriptionRepository
+from src.repositories.user import user_repo
+from src.schemas.events import SubscriptionChangedEvent
+from src.schemas.subscription import SubscriptionChange, SubscriptionRead
+
+
+class SubscriptionService:
+    """
+    Service for subscribing users to monitored accounts.
+    All repositories share the request's DB session; the caller commits.
+    """
+
+    def __init__(
+        self,
+        subscription_repo: SubscriptionRepository,
+        account_repo: MonitoredAccountRepository,
+        outbox_repo: EventOutboxRepository
+    ):
+        self.subscription_repo = subscription_repo
+        self.account_repo = account_repo
+        self.outbox_repo = outbox_repo
+
+    async def subscribe(
+        self, user_id: uuid.UUID, username: str, keywords: list[str] | None = None
+    ) -> SubscriptionRead | None:
+        """
+        Subscribe a user to an account (idempotent). Subscribing again with
+        other keywords replaces the filters; no keywords means every video.
+
+        Returns:
+            The subscription, or None if the user or account does not exist.
+        """
+        account = await self.account_repo.get_by_username(username)
+        if account is None or await user_repo.get(self.subscription_repo.db, user_id) is None:
+            return None
+
+        keywords = keywords or None
+        created_at = await self.subscription_repo.add_subscription(user_id, account.id, keywords)
+        if created_at is None:
+            # Already subscribed: only a filter change needs publishing
+            if await self.subscription_repo.update_keywords(user_id, account.id, keywords):
+                self._publish_change(user_id, account.id, account.username, "updated")
+            existing = await self.subscription_repo.get_subscription(user_id, account.id)
+            created_at = existing.created_at
+        else:
+            self._publish_change(user_id, account.id, account.username, "subscribed")
+
+        return SubscriptionRead(
+            user_id=user_id,
+            account_id=account.id,
+            username=account.username,
+            keywords=keywords or [],
+            created_at=created_at,
+        )
+
+    async def unsubscribe(self, user_id: uuid.UUID, username: str) -> bool:
+        """Remove a subscription; False if it did not exist."""
+        account = await self.account_repo.get_by_username(username)
+        if account is None:
+            return False
+
+        removed = await self.subscription_repo.remove_subscription(user_id, account.id)
+        if removed:
+            self._publish_change(user_id, account.id, account.username, "unsubscribed")
+        return removed
+
+    def _publish_change(self, user_id: uuid.UUID, account_id: uuid.UUID, username: str, action: str):
+        event = SubscriptionChangedEvent(
+            payload=SubscriptionChange(
+                user_id=user_id,
+                account_id=account_id,
+                account_username=username,
+                action=action,
+                changed_at=datetime.now(timezone.utc),
+            )
+        )
+        self.outbox_repo.add_event(event)
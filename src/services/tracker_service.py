@@ -1,34 +1,92 @@
 """
 Tracker Service - Business logic for monitoring TikTok accounts.
 Implements the Fan-Out pattern for video discovery and event publishing.
+Each poll also reschedules the account: frequent posters are polled often,
+dormant accounts rarely.
 """
+from datetime import datetime, timedelta, timezone
+
+from src.core.config import settings
 from src.schemas.video import TikTokVideo
-from src.core.kafka import EventProducer
+from src.schemas.events import VideoFoundEvent
 from src.repositories.account import MonitoredAccountRepository
 from src.repositories.video import ProcessedVideoRepository
+from src.repositories.outbox import EventOutboxRepository
+from src.repositories.subscription import SubscriptionRepository
 from src.models.account import MonitoredAccountModel
-from src.models.video import ProcessedVideoModel
+from src.services.lanes import LaneRouter, lane_router
+from src.services.video_fetcher import VideoFetcher
+from src.services.video_filter import ProcessedVideoFilter
+
+
+def smoothed_post_interval(
+    previous: float | None,
+    last_posted_at: datetime | None,
+    post_times: list[datetime],
+    smoothing: float = settings.TRACKER_INTERVAL_SMOOTHING,
+) -> float | None:
+    """
+    Fold the gaps between newly seen videos into an account's smoothed
+    (exponentially weighted) gap between videos, in seconds.
+    """
+    times = sorted(post_times)
+    if last_posted_at is not None:
+        times = [last_posted_at, *(t for t in times if t > last_posted_at)]
 
-# Placeholder for TikTok API
-from TikTokApi import TikTokApi
+    interval = previous
+    for earlier, later in zip(times, times[1:]):
+        gap = (later - earlier).total_seconds()
+        interval = gap if interval is None else smoothing * gap + (1 - smoothing) * interval
+    return interval
+
+
+def poll_interval(
+    avg_post_interval: float | None,
+    last_posted_at: datetime | None,
+    now: datetime,
+    factor: float = settings.TRACKER_INTERVAL_FACTOR,
+    minimum: float = settings.TRACKER_MIN_INTERVAL_SECONDS,
+    default: float = settings.TRACKER_DEFAULT_INTERVAL_SECONDS,
+    maximum: float = settings.TRACKER_MAX_INTERVAL_SECONDS,
+) -> float:
+    """
+    Seconds until an account should be polled again.
+    A fraction of its usual gap between videos, so a new video is detected
+    within that fraction of the gap; an account silent for longer than
+    usual backs off in proportion to its silence.
+    """
+    interval = default if avg_post_interval is None else avg_post_interval * factor
+    if last_posted_at is not None:
+        interval = max(interval, (now - last_posted_at).total_seconds() * factor)
+    return min(max(interval, minimum), maximum)
 
 
 class TrackerService:
     """
     Service for tracking monitored accounts and discovering new videos.
-    Uses repository pattern for data access and event producer for notifications.
+    Uses repository pattern for data access and the event outbox for notifications.
     """
     
     def __init__(
         self, 
         account_repo: MonitoredAccountRepository, 
         video_repo: ProcessedVideoRepository, 
-        producer: EventProducer
+        outbox_repo: EventOutboxRepository,
+        subscription_repo: SubscriptionRepository | None = None,
+        lanes: LaneRouter = lane_router,
+        fetcher: VideoFetcher | None = None,
+        video_filter: ProcessedVideoFilter | None = None,
     ):
         self.account_repo = account_repo
         self.video_repo = video_repo
-        self.producer = producer
-        self.api = TikTokApi()
+        self.outbox_repo = outbox_repo
+        self.subscription_repo = subscription_repo or SubscriptionRepository(outbox_repo.db)
+        self.lanes = lanes
+        # Long-lived and shared; only needed by process_account()
+        self.fetcher = fetcher
+        self.video_filter = video_filter
+        # Video IDs to add to the filter once the caller committed their rows
+        self.filter_pending: list[str] = []
 
     async def get_active_accounts(self):
         """Get all active monitored accounts."""
@@ -41,19 +99,102 @@ class TrackerService:
     async def mark_video_processed(self, video: TikTokVideo, account_id):
         """
         Mark a video as processed to prevent duplicate notifications.
+        The VideoFoundEvent is queued in the outbox in the same transaction,
+        so the dedup record and the event are committed (or lost) together.
+        The outbox relay publishes it to Kafka off the hot path, on the
+        fast or bulk lane depending on the author's audience size.
+        """
+        topic = await self.lanes.topic_for(self.subscription_repo, video.author_username)
+        self.video_repo.mark_processed(video.platform_id, account_id)
+        self.outbox_repo.add_event(VideoFoundEvent(payload=video), topic=topic)
+        await self.video_repo.commit(self.video_repo.db)
+
+    async def add_new_videos(
+        self, videos: list[TikTokVideo], account_id, published_after: datetime | None = None
+    ) -> list[TikTokVideo]:
+        """
+        Bulk counterpart of is_video_processed() + mark_video_processed():
+        records all scraped videos with a single INSERT ... ON CONFLICT DO
+        NOTHING RETURNING and queues VideoFoundEvents for the ones it
+        actually inserted, in the caller's transaction. Videos created
+        before published_after are recorded but not published.
+        With a video_filter, IDs it has seen before are first checked with
+        a read-only query and the insert is skipped when nothing is left;
+        the others are queued in self.filter_pending, to be added to the
+        filter once the rows are committed.
+        Note: The caller commits.
+
+        Returns:
+            The published videos, oldest first.
         """
-        new_entry = ProcessedVideoModel(
-            video_id=video.platform_id, 
-            account_id=account_id
+        candidates = [video.platform_id for video in videos]
+        if self.video_filter is not None:
+            candidates = await self.video_filter.unseen(self.video_repo, candidates)
+        new_ids = await self.video_repo.insert_new(candidates, account_id)
+        if self.video_filter is not None:
+            # Inserted here or by another replica: recorded either way
+            self.filter_pending.extend(candidates)
+        published = sorted(
+            (
+                video for video in {video.platform_id: video for video in videos}.values()
+                if video.platform_id in new_ids
+                and (published_after is None or video.created_at >= published_after)
+            ),
+            key=lambda video: video.created_at,
         )
-        self.video_repo.add(new_entry)
-        await self.video_repo.commit()
+        if published:
+            topics = await self.lanes.topics_for(self.subscription_repo, {video.author_username for video in published})
+            for video in published:
+                self.outbox_repo.add_event(VideoFoundEvent(payload=video), topic=topics[video.author_username])
+        return published
 
-    async def process_account(self, account: MonitoredAccountModel):
+    async def fetch_recent_videos(
+        self, username: str, count: int = settings.TRACKER_VIDEOS_PER_POLL
+    ) -> list[TikTokVideo]:
+        """Fetch the newest videos of an account through the video fetcher."""
+        if self.fetcher is None:
+            raise RuntimeError("TrackerService has no video fetcher!")
+        return await self.fetcher.fetch_recent_videos(username, count)
+
+    async def process_account(self, account: MonitoredAccountModel) -> list[TikTokVideo]:
         """
-        Process a single monitored account.
-        This is where the actual TikTok scraping logic would go.
+        Poll a single monitored account, queue events for its new videos,
+        schedule its next poll and release its lease.
+        Dedup records, events and the new schedule are committed in one
+        transaction. On the first poll, videos posted before the account
+        was added are only recorded, so subscribers are not sent its back
+        catalogue.
+
+        Returns:
+            The videos that were published.
         """
         print(f"🔎 Checking @{account.username}...")
-        # Mock logic - in production, this would call TikTok API
-        pass
+        now = datetime.now(timezone.utc)
+        videos = await self.fetch_recent_videos(account.username)
+
+        published = await self.add_new_videos(
+            videos, account.id,
+            published_after=account.created_at if account.last_scraped_at is None else None,
+        )
+
+        post_times = [
+            video.created_at for video in videos
+            if account.last_posted_at is None or video.created_at > account.last_posted_at
+        ]
+        account.avg_post_interval_seconds = smoothed_post_interval(
+            account.avg_post_interval_seconds, account.last_posted_at, post_times
+        )
+        if post_times:
+            account.last_posted_at = max(post_times)
+        account.last_scraped_at = now
+        account.next_poll_at = now + timedelta(
+            seconds=poll_interval(account.avg_post_interval_seconds, account.last_posted_at, now)
+        )
+        # Done: the account is free for whichever replica finds it due next
+        account.leased_by = None
+        account.leased_until = None
+        await self.account_repo.commit(self.account_repo.db)
+        if self.video_filter is not None:
+            self.video_filter.add_many(self.filter_pending)
+            self.filter_pending.clear()
+        return published
@@ -0,0 +1,281 @@
+"""
+Video Fetchers - where the tracker gets accounts' newest videos from.
+TikTokFetcher scrapes through a pool of long-lived TikTokApi browser
+sessions, so scraping throughput is bounded by the pool size rather than
+by browser startup; FakeFetcher serves synthetic accounts for local runs
+and load tests.
+"""
+import abc
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.schemas.video import TikTokVideo
+
+from TikTokApi import TikTokApi
+
+
+class SessionPoolExhausted(Exception):
+    """No browser session became free within the acquire timeout."""
+
+
+class VideoFetcher(abc.ABC):
+    """
+    Base class for video sources.
+    fetch_recent_videos() returns an account's newest videos, newest first;
+    `concurrency` is how many fetches it serves at once without queueing.
+    """
+    concurrency: int = 1
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abc.abstractmethod
+    async def fetch_recent_videos(self, username: str, count: int) -> list[TikTokVideo]:
+        """An account's newest videos (up to count), newest first."""
+
+
+@dataclass(eq=False)
+class _PooledSession:
+    api: object
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+async def _create_tiktok_api(ms_token: str | None = settings.TIKTOK_MS_TOKEN):
+    """One TikTokApi instance with a single warmed-up browser session."""
+    api = TikTokApi()
+    await api.create_sessions(num_sessions=1, ms_tokens=[ms_token] if ms_token else None)
+    return api
+
+
+class TikTokSessionPool:
+    """
+    Pool of pre-warmed TikTokApi browser sessions shared by a process.
+
+    Every session is its own TikTokApi instance, so one can be replaced
+    without disturbing the others. acquire() waits up to acquire_timeout
+    for an idle session and health-checks it before handing it out. A
+    session is recycled after max_uses, or at once when a fetch failed on
+    it; replacements start in the background, so releasing never waits
+    on a browser launch.
+    """
+    def __init__(
+        self,
+        size: int = settings.TIKTOK_SESSIONS,
+        max_uses: int = settings.TIKTOK_SESSION_MAX_USES,
+        acquire_timeout: float = settings.TIKTOK_ACQUIRE_TIMEOUT_SECONDS,
+        factory: Callable[[], Awaitable[object]] = _create_tiktok_api,
+    ):
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.factory = factory
+        self._idle: asyncio.Queue[_PooledSession] = asyncio.Queue()
+        self._live: set[_PooledSession] = set()
+        self._replacing: set[asyncio.Task] = set()
+
+        self.recycled = metrics.counter("tiktok.sessions_recycled")
+        self.errors = metrics.counter("tiktok.session_errors")
+        self.timeouts = metrics.counter("tiktok.acquire_timeouts")
+        self.acquire_ms = metrics.summary("tiktok.acquire_ms")
+        metrics.gauge("tiktok.sessions", lambda: len(self._live))
+        metrics.gauge("tiktok.sessions_idle", self._idle.qsize)
+
+    async def start(self):
+        """Warm up all sessions concurrently before the first fetch."""
+        results = await asyncio.gather(*(self._create() for _ in range(self.size)), return_exceptions=True)
+        failed = [result for result in results if isinstance(result, BaseException)]
+        if failed:
+            # Do not leave the browsers that did start running
+            for session in list(self._live):
+                await self._close(session)
+            raise failed[0]
+        for session in results:
+            self._idle.put_nowait(session)
+
+    async def stop(self):
+        for task in self._replacing:
+            task.cancel()
+        await asyncio.gather(*self._replacing, return_exceptions=True)
+        for session in list(self._live):
+            await self._close(session)
+
+    async def _create(self) -> _PooledSession:
+        session = _PooledSession(await self.factory())
+        self._live.add(session)
+        return session
+
+    async def _close(self, session: _PooledSession):
+        self._live.discard(session)
+        try:
+            await session.api.close_sessions()
+        except Exception as e:
+            print(f"⚠️ Closing TikTok session failed: {e}")
+
+    async def _healthy(self, session: _PooledSession) -> bool:
+        try:
+            return (await session.api.health_check())["healthy_sessions"] > 0
+        except Exception:
+            return False
+
+    def _replace(self, session: _PooledSession):
+        self.recycled.inc()
+        task = asyncio.create_task(self._replace_session(session))
+        self._replacing.add(task)
+        task.add_done_callback(self._replacing.discard)
+
+    async def _replace_session(self, session: _PooledSession):
+        await self._close(session)
+        delay = 1.0
+        while True:
+            try:
+                self._idle.put_nowait(await self._create())
+                return
+            except Exception as e:
+                print(f"❌ Starting TikTok session failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+
+    async def acquire(self) -> _PooledSession:
+        start = time.monotonic()
+        deadline = start + self.acquire_timeout
+        while True:
+            try:
+                session = await asyncio.wait_for(self._idle.get(), deadline - time.monotonic())
+            except TimeoutError:
+                self.timeouts.inc()
+                raise SessionPoolExhausted(f"No TikTok session free after {self.acquire_timeout:g}s")
+            try:
+                healthy = await self._healthy(session)
+            except BaseException:
+                # Cancelled mid-check: hand the session back instead of losing it
+                self._idle.put_nowait(session)
+                raise
+            if healthy:
+                self.acquire_ms.observe((time.monotonic() - start) * 1000)
+                return session
+            self._replace(session)
+
+    def release(self, session: _PooledSession, ok: bool = True):
+        session.uses += 1
+        if not ok:
+            self.errors.inc()
+        if not ok or session.uses >= self.max_uses:
+            self._replace(session)
+        else:
+            self._idle.put_nowait(session)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[object]:
+        """Borrow a session's TikTokApi; an exception inside recycles it."""
+        session = await self.acquire()
+        ok = False
+        try:
+            yield session.api
+            ok = True
+        finally:
+            self.release(session, ok)
+
+
+def video_from_tiktok(username: str, video) -> TikTokVideo:
+    """Convert a TikTokApi Video into our domain model."""
+    data = video.as_dict
+    return TikTokVideo(
+        platform_id=str(video.id),
+        author_username=username,
+        caption=data.get("desc", ""),
+        video_url=f"https://www.tiktok.com/@{username}/video/{video.id}",
+        cover_image_url=data.get("video", {}).get("cover") or None,
+        created_at=datetime.fromtimestamp(int(data["createTime"]), timezone.utc),
+    )
+
+
+class TikTokFetcher(VideoFetcher):
+    """Scrapes TikTok through a TikTokSessionPool."""
+
+    def __init__(self, pool: TikTokSessionPool | None = None):
+        self.pool = pool or TikTokSessionPool()
+        self.concurrency = self.pool.size
+
+    async def start(self):
+        await self.pool.start()
+
+    async def stop(self):
+        await self.pool.stop()
+
+    async def fetch_recent_videos(self, username: str, count: int) -> list[TikTokVideo]:
+        async with self.pool.session() as api:
+            return [video_from_tiktok(username, video) async for video in api.user(username=username).videos(count=count)]
+
+
+class FakeFetcher(VideoFetcher):
+    """
+    Synthetic TikTok for local runs and load tests, no network involved.
+
+    Each account posts on its own fixed schedule, between every
+    min_interval and max_interval seconds depending on a hash of its
+    username, so the adaptive scheduler sees both busy and dormant
+    accounts. A fetch takes `latency` seconds, and at most `sessions`
+    run at once, mimicking the session pool.
+    """
+    def __init__(
+        self,
+        latency: float = settings.FAKE_TIKTOK_LATENCY_SECONDS,
+        sessions: int = settings.TIKTOK_SESSIONS,
+        min_interval: float = 600.0,
+        max_interval: float = 7 * 86400.0,
+    ):
+        self.latency = latency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.concurrency = sessions
+        self._slots = asyncio.Semaphore(sessions)
+
+    def _schedule(self, username: str) -> tuple[int, float, float]:
+        """(account number, post interval, phase) of an account, stable across runs."""
+        digest = int.from_bytes(hashlib.blake2b(username.encode("utf-8"), digest_size=8).digest(), "little")
+        share = (digest % 10_000) / 10_000
+        # Log-uniform, so most accounts post rarely and a few very often
+        interval = self.min_interval * (self.max_interval / self.min_interval) ** share
+        return digest % 10**9, interval, (digest >> 16) % int(interval)
+
+    async def fetch_recent_videos(self, username: str, count: int) -> list[TikTokVideo]:
+        async with self._slots:
+            await asyncio.sleep(self.latency)
+
+        account, interval, phase = self._schedule(username)
+        newest = int((time.time() - phase) // interval)
+        videos = []
+        for n in range(newest, max(newest - count, -1), -1):
+            posted_at = phase + n * interval
+            platform_id = f"{account}{n:010d}"
+            videos.append(TikTokVideo(
+                platform_id=platform_id,
+                author_username=username,
+                caption=f"Video #{n} of @{username}",
+                video_url=f"https://www.tiktok.com/@{username}/video/{platform_id}",
+                created_at=datetime.fromtimestamp(posted_at, timezone.utc),
+            ))
+        return videos
+
+
+VIDEO_FETCHERS: dict[str, type[VideoFetcher]] = {
+    "tiktok": TikTokFetcher,
+    "fake": FakeFetcher,
+}
+
+
+def get_video_fetcher(name: str = settings.TRACKER_FETCHER) -> VideoFetcher:
+    if name not in VIDEO_FETCHERS:
+        raise ValueError(f"Unknown video fetcher '{name}'")
+    return VIDEO_FETCHERS[name]()
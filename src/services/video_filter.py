@@ -0,0 +1,118 @@
+"""
+Processed-Video Filter - in-memory front for processed_videos lookups.
+A scalable Bloom filter of every recorded video ID: IDs it has never seen
+go straight to the dedup insert, and only "maybe present" IDs are checked
+against the table, with a read-only query.
+"""
+import os
+import time
+from datetime import datetime, timezone
+from typing import Iterable
+
+from src.core.config import settings
+from src.core.db import AsyncSessionLocal
+from src.core.metrics import metrics
+from src.repositories.video import ProcessedVideoRepository
+from src.utils.bloom import ScalableBloomFilter
+
+# Rows are stamped with their transaction's start time, so a catch-up from
+# a snapshot re-reads this far back to include transactions that were still
+# open when it was taken
+CATCH_UP_SLACK_SECONDS = 600.0
+
+
+class ProcessedVideoFilter:
+    """
+    Per-process Bloom filter of processed video IDs.
+
+    It only ever decides whether a DB read is needed: a false positive
+    costs a read, and a missing ID (recorded by another replica, or while
+    the filter was loading) falls through to the INSERT ... ON CONFLICT,
+    which remains the actual dedup check.
+    """
+    def __init__(
+        self,
+        capacity: int = settings.TRACKER_BLOOM_CAPACITY,
+        error_rate: float = settings.TRACKER_BLOOM_ERROR_RATE,
+        snapshot_path: str = settings.TRACKER_BLOOM_SNAPSHOT_PATH,
+        chunk_size: int = settings.TRACKER_BLOOM_SEED_CHUNK_SIZE,
+    ):
+        self.bloom = ScalableBloomFilter(capacity, error_rate)
+        self.snapshot_path = snapshot_path
+        self.chunk_size = chunk_size
+        self._synced_at: float | None = None
+
+        self.absent = metrics.counter("bloom.definitely_absent")
+        self.maybe = metrics.counter("bloom.maybe_present")
+        self.false_positives = metrics.counter("bloom.false_positives")
+        metrics.gauge("bloom.keys", lambda: len(self.bloom))
+        metrics.gauge("bloom.bytes", lambda: self.bloom.nbytes)
+        metrics.gauge("bloom.estimated_fp_rate", lambda: round(self.bloom.estimated_error_rate, 5))
+        metrics.gauge("bloom.observed_fp_rate", self._observed_fp_rate)
+
+    def _observed_fp_rate(self) -> float:
+        # Share of IDs not in the table that the filter still reported as maybe
+        # present; a lower bound, as maybe-present IDs that ride along in an
+        # insert are never checked
+        negatives = self.false_positives.value + self.absent.value
+        return round(self.false_positives.value / negatives, 5) if negatives else 0.0
+
+    async def load(self):
+        """Restore the snapshot, if any, then add rows recorded since with a streamed query."""
+        since = None
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                self.bloom, meta = ScalableBloomFilter.load(self.snapshot_path)
+                since = datetime.fromtimestamp(meta["synced_at"] - CATCH_UP_SLACK_SECONDS, timezone.utc)
+            except Exception as e:
+                print(f"⚠️ Ignoring Bloom filter snapshot {self.snapshot_path}: {e}")
+
+        started = time.time()
+        loaded = 0
+        async with AsyncSessionLocal() as session:
+            async for chunk in ProcessedVideoRepository(session).stream_video_ids(self.chunk_size, since):
+                self.add_many(chunk)
+                loaded += len(chunk)
+        self._synced_at = started
+        print(
+            f"🌸 Video filter: {len(self.bloom):,} IDs in {self.bloom.nbytes / 1024:,.0f} KiB "
+            f"({loaded:,} read from DB in {time.time() - started:.1f}s)"
+        )
+
+    def save(self):
+        """Snapshot the filter to disk, if a snapshot path is configured."""
+        if self.snapshot_path and self._synced_at is not None:
+            # Stamped with the snapshot time, so a restart only re-reads the
+            # rows recorded since (plus the slack). Rows other replicas
+            # recorded after the load may be missing from it; like any
+            # missing ID they cost an insert that hits ON CONFLICT.
+            synced_at = time.time()
+            self.bloom.save(self.snapshot_path, synced_at=synced_at)
+            self._synced_at = synced_at
+
+    def add_many(self, video_ids: Iterable[str]):
+        for video_id in video_ids:
+            self.bloom.add(video_id)
+
+    async def unseen(self, repo: ProcessedVideoRepository, video_ids: Iterable[str]) -> list[str]:
+        """
+        The IDs the caller should insert. When every ID is maybe present
+        (the usual re-scan), they are checked with one read-only query and
+        only the false positives are returned. Once any ID is definitely
+        new, an insert is needed anyway and its ON CONFLICT settles the
+        others in the same statement, so all of them are returned unread.
+        """
+        absent, maybe = [], []
+        for video_id in dict.fromkeys(video_ids):
+            (maybe if video_id in self.bloom else absent).append(video_id)
+        self.absent.inc(len(absent))
+        self.maybe.inc(len(maybe))
+
+        if absent:
+            return absent + maybe
+        if maybe:
+            existing = await repo.find_existing(maybe)
+            false_positives = [video_id for video_id in maybe if video_id not in existing]
+            self.false_positives.inc(len(false_positives))
+            return false_positives
+        return []
@@ -0,0 +1,74 @@
+"""
+Benchmark: event wire codecs vs. the original JSON path.
+Run with: python -m src.test.bench_codecs [iterations]
+"""
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from src.schemas.codecs import CODECS
+from src.schemas.events import BaseEvent, VideoFoundEvent
+from src.schemas.video import TikTokVideo
+
+
+def make_event() -> VideoFoundEvent:
+    video = TikTokVideo(
+        platform_id="7283910293847561234",
+        author_username="some_creator",
+        caption="New dance challenge #fyp #dance #viral 🎶",
+        video_url="https://www.tiktok.com/@some_creator/video/7283910293847561234",
+        cover_image_url="https://p16-sign.tiktokcdn.com/obj/cover-7283910293847561234.jpeg",
+        created_at=datetime.now(timezone.utc),
+    )
+    return VideoFoundEvent(payload=video)
+
+
+def bench(label: str, encode, decode, iterations: int):
+    data = encode()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode()
+    encode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(data)
+    decode_s = time.perf_counter() - start
+
+    print(
+        f"{label:<16} {len(data):>6} B  "
+        f"encode {iterations / encode_s:>10,.0f}/s  "
+        f"decode {iterations / decode_s:>10,.0f}/s"
+    )
+
+
+def main(iterations: int = 50_000):
+    event = make_event()
+    print(f"📊 {iterations:,} iterations per codec\n")
+
+    # Baseline: what send_event / consume_events did before codecs
+    bench(
+        "legacy json",
+        lambda: event.model_dump_json().encode("utf-8"),
+        lambda data: VideoFoundEvent(**json.loads(data.decode("utf-8"))),
+        iterations,
+    )
+
+    for codec_id in CODECS:
+        try:
+            _, headers = event.encode(codec_id)
+        except RuntimeError as e:
+            print(f"{codec_id:<16} skipped ({e})")
+            continue
+        bench(
+            codec_id,
+            lambda codec_id=codec_id: event.encode(codec_id)[0],
+            lambda data, headers=headers: BaseEvent.decode(data, headers),
+            iterations,
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
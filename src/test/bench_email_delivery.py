@@ -0,0 +1,123 @@
+"""
+Benchmark: fan-out through the SMTP delivery engine into a local aiosmtpd sink.
+Run with: python -m src.test.bench_email_delivery [messages] [pipeline_depth] [rtt_ms] [pool_size]
+
+The sink runs in its own process so it does not share the GIL with the
+client, and delays everything it reads by rtt_ms to stand in for the
+network round trip to a real relay. It refuses every 100th recipient once
+with a transient 451, so the run also exercises per-recipient retries.
+Messages are built before the clock starts; building is reported apart.
+Needs aiosmtplib and aiosmtpd.
+"""
+import asyncio
+import multiprocessing
+import sys
+import time
+from email.message import EmailMessage
+
+from aiosmtpd.smtp import SMTP
+
+from src.services.email_delivery import DeliveryEngine, SmtpBackend
+
+HOST, PORT = "127.0.0.1", 8025
+
+
+class SinkHandler:
+    """Counts delivered messages; defers some recipients on first try."""
+    def __init__(self, delivered):
+        self.delivered = delivered
+        self.deferred: set[str] = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        index = int(address.split("@")[0].removeprefix("user"))
+        if index % 100 == 0 and address not in self.deferred:
+            self.deferred.add(address)
+            return "451 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        # aiosmtpd reads commands off a stream, so it copes with pipelining
+        session.host_name = hostname
+        return [*responses[:-1], "250-PIPELINING", responses[-1]]
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.delivered.get_lock():
+            self.delivered.value += len(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+class LaggySMTP(SMTP):
+    """Sees every chunk the client sent `rtt` seconds late, in order."""
+    def __init__(self, handler, rtt: float):
+        super().__init__(handler)
+        self.rtt = rtt
+        self.lagged: asyncio.Queue[tuple[float, bytes]] = asyncio.Queue()
+        self.pump = asyncio.get_running_loop().create_task(self._pump())
+
+    def data_received(self, data: bytes):
+        self.lagged.put_nowait((time.monotonic() + self.rtt, data))
+
+    async def _pump(self):
+        while True:
+            due, data = await self.lagged.get()
+            await asyncio.sleep(due - time.monotonic())
+            super().data_received(data)
+
+    def connection_lost(self, exc):
+        self.pump.cancel()
+        super().connection_lost(exc)
+
+
+def run_sink(delivered, ready, rtt: float):
+    async def serve():
+        handler = SinkHandler(delivered)
+        await asyncio.get_running_loop().create_server(lambda: LaggySMTP(handler, rtt), HOST, PORT)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def make_message(i: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "EventPulse <notifications@eventpulse.local>"
+    message["To"] = f"user{i}@example.com"
+    message["Subject"] = "New TikTok from @some_creator!"
+    message.set_content("Check it out here -> https://www.tiktok.com/@some_creator/video/7283910293847561234")
+    return message
+
+
+async def main(count: int = 50_000, depth: int = 10, rtt_ms: int = 20, pool_size: int = 20):
+    delivered, ready = multiprocessing.Value("q", 0), multiprocessing.Event()
+    sink = multiprocessing.Process(target=run_sink, args=(delivered, ready, rtt_ms / 1000), daemon=True)
+    sink.start()
+    ready.wait()
+
+    start = time.perf_counter()
+    messages = [make_message(i) for i in range(count)]
+    built = time.perf_counter() - start
+
+    engine = DeliveryEngine(
+        SmtpBackend(hostname=HOST, port=PORT, pool_size=pool_size, pipeline_depth=depth),
+        concurrency=pool_size * depth,
+        retry_backoff=0.05,
+    )
+    await engine.start()
+    try:
+        start = time.perf_counter()
+        report = await engine.send_many(messages)
+        elapsed = time.perf_counter() - start
+    finally:
+        await engine.stop()
+        sink.terminate()
+
+    print(f"📊 {count:,} emails, {pool_size} connections, pipeline depth {depth}, {rtt_ms} ms round trip")
+    print(f"built in {built:.2f}s ({built / count * 1e6:.0f} µs per message)")
+    print(f"sent {report.sent:,}, failed {len(report.failed)}")
+    print(f"sink received {delivered.value:,} in {elapsed:.2f}s ({count / elapsed:,.0f} emails/s)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:5]]
+    asyncio.run(main(*args))
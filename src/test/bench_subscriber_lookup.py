@@ -0,0 +1,103 @@
+"""
+Benchmark: per-event subscriber lookup vs. one batched ANY(:names) query.
+Run with: python -m src.test.bench_subscriber_lookup [accounts] [users] [events]
+
+Needs a reachable Postgres at DATABASE_URL. Synthetic data is written to a
+throwaway "bench_subscribers" schema that is dropped afterwards.
+"""
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.config import settings
+from src.models import MonitoredAccountModel, SubscriptionModel, UserModel
+from src.models.base import Base
+from src.repositories.subscription import SubscriptionRepository
+
+SCHEMA = "bench_subscribers"
+SUBSCRIPTIONS_PER_USER = 5
+
+
+async def seed(session, accounts: int, users: int) -> list[str]:
+    usernames = [f"creator_{i}" for i in range(accounts)]
+    account_ids = [uuid.uuid4() for _ in usernames]
+    user_ids = [uuid.uuid4() for _ in range(users)]
+
+    await session.execute(insert(MonitoredAccountModel), [
+        {"id": account_id, "username": name} for account_id, name in zip(account_ids, usernames)
+    ])
+    await session.execute(insert(UserModel), [
+        {"id": user_id, "email": f"user_{i}@example.com"} for i, user_id in enumerate(user_ids)
+    ])
+    await session.execute(insert(SubscriptionModel), [
+        {"user_id": user_id, "account_id": account_id}
+        for user_id in user_ids
+        for account_id in random.sample(account_ids, min(SUBSCRIPTIONS_PER_USER, accounts))
+    ])
+    await session.commit()
+    return usernames
+
+
+async def per_event(repo: SubscriptionRepository, names: list[str]) -> int:
+    """What handle_events did before: one join per event."""
+    total = 0
+    for name in names:
+        total += len(await repo.get_subscribers_for_account(name))
+    return total
+
+
+async def batched(repo: SubscriptionRepository, names: list[str]) -> int:
+    """One query for the distinct authors, fanned back out per event."""
+    by_account = await repo.get_subscribers_for_accounts(names)
+    return sum(len(by_account.get(name, ())) for name in names)
+
+
+async def bench(label: str, sessionmaker, lookup, names: list[str], rounds: int):
+    timings = []
+    for _ in range(rounds):
+        async with sessionmaker() as session:
+            start = time.perf_counter()
+            found = await lookup(SubscriptionRepository(session), names)
+            timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<12} best {best * 1000:>8.1f} ms  ({len(names) / best:>10,.0f} events/s, {found} notifications)")
+    return best
+
+
+async def main(accounts: int = 300, users: int = 5_000, events: int = 500, rounds: int = 5):
+    engine = create_async_engine(
+        str(settings.DATABASE_URL),
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with sessionmaker() as session:
+            usernames = await seed(session, accounts, users)
+
+        # A batch as the worker sees it: the same authors show up repeatedly
+        names = [random.choice(usernames) for _ in range(events)]
+        print(f"📊 {events} events over {len(set(names))} distinct accounts, {users:,} users\n")
+
+        slow = await bench("per-event", sessionmaker, per_event, names, rounds)
+        fast = await bench("batched", sessionmaker, batched, names, rounds)
+        print(f"\n⚡ Batched lookup is {slow / fast:.1f}x faster")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    asyncio.run(main(*args))
@@ -0,0 +1,85 @@
+"""
+Load test: the tracker scheduler against the fake TikTok backend.
+Run with: python -m src.test.bench_tracker [accounts] [sessions] [seconds]
+
+Needs a reachable Postgres at DATABASE_URL. Accounts are written to a
+throwaway "bench_tracker" schema that is dropped afterwards. Every fake
+fetch takes FAKE_TIKTOK_LATENCY_SECONDS while holding one of `sessions`
+slots, so polls/s should approach sessions / latency.
+"""
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.config import settings
+from src.models import MonitoredAccountModel
+from src.models.base import Base
+from src.services.video_fetcher import FakeFetcher
+from src.worker.tracker import TrackerScheduler
+
+SCHEMA = "bench_tracker"
+
+
+async def main(accounts: int = 2_000, sessions: int = 10, seconds: int = 20):
+    engine = create_async_engine(
+        str(settings.DATABASE_URL),
+        pool_size=sessions * 2,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(Base.metadata.create_all)
+
+        # Tracked for a while already, so first polls only publish recent videos
+        added_at = datetime.now(timezone.utc) - timedelta(days=1)
+        async with sessionmaker() as session:
+            await session.execute(insert(MonitoredAccountModel), [
+                {"id": uuid.uuid4(), "username": f"creator_{i}", "created_at": added_at}
+                for i in range(accounts)
+            ])
+            await session.commit()
+
+        fetcher = FakeFetcher(sessions=sessions)
+        scheduler = TrackerScheduler(fetcher, sessionmaker=sessionmaker)
+        await fetcher.start()
+
+        start = time.perf_counter()
+        run = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await run
+        elapsed = time.perf_counter() - start
+        await fetcher.stop()
+
+        async with sessionmaker() as session:
+            intervals = (await session.execute(text(
+                "SELECT percentile_cont(ARRAY[0.1, 0.5, 0.9]) WITHIN GROUP ("
+                "ORDER BY extract(epoch FROM next_poll_at - last_scraped_at)) "
+                "FROM monitored_accounts WHERE last_scraped_at IS NOT NULL"
+            ))).scalar_one()
+
+        polls = scheduler.polls.value
+        print(f"📊 {accounts:,} accounts, {sessions} sessions, {fetcher.latency * 1000:.0f} ms per fetch")
+        print(f"polls {polls:,} in {elapsed:.1f}s ({polls / elapsed:,.1f}/s, ceiling {sessions / fetcher.latency:,.1f}/s)")
+        print(f"new videos {scheduler.new_videos.value:,}, errors {scheduler.errors.value}")
+        if intervals:
+            p10, p50, p90 = (value / 60 for value in intervals)
+            print(f"next poll in p10 {p10:.0f} min, p50 {p50:.0f} min, p90 {p90:.0f} min")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    asyncio.run(main(*args))
@@ -0,0 +1,59 @@
+"""
+Check: caption keywords match whole words, not any substring.
+Run with: python -m src.test.check_keyword_matching
+
+"art" must notify for "art", "#art" or "Art!" but not for "party" or
+"smart"; phrases and hashtag keywords follow the same rule.
+"""
+import uuid
+from types import SimpleNamespace
+
+from src.services.subscriber_cache import AccountSubscribers
+from src.utils.aho_corasick import AhoCorasick
+
+
+def make_subscribers(filters: dict[str, list[str]]) -> AccountSubscribers:
+    return AccountSubscribers.from_rows(
+        SimpleNamespace(id=uuid.uuid4(), email=f"{name}@example.com", keywords=keywords)
+        for name, keywords in filters.items()
+    )
+
+
+def check_automaton():
+    automaton = AhoCorasick(["art", "#art", "new york", "c++"])
+    cases = {
+        "party time": set(),
+        "smart art": {"art"},
+        "art": {"art"},
+        "#art of the day": {"art", "#art"},
+        "#artist life": set(),
+        "(art), again": {"art"},
+        "art_deco": set(),
+        "new york nights": {"new york"},
+        "new yorker": set(),
+        "learning c++ today": {"c++"},
+    }
+    for text, expected in cases.items():
+        found = automaton.find_words(text)
+        assert found == expected, (text, found, expected)
+    # Substring matching is still available where it is wanted
+    assert automaton.find_all("party") == {"art"}
+
+
+def check_subscribers():
+    subscribers = make_subscribers({"all": [], "art": ["Art"], "dance": ["dance", "#fyp"]})
+
+    def notified(caption: str) -> list[str]:
+        return [s.email.split("@")[0] for s in subscribers.matching(caption)]
+
+    print(f"'Party time 🎉' notifies {notified('Party time 🎉')}")
+    assert notified("Party time 🎉") == ["all"]
+    assert notified("Street ART in Berlin") == ["all", "art"]
+    assert notified("New #art drop #fyp") == ["all", "art", "dance"]
+    assert notified("Dancer warmup #fypage") == ["all"]
+
+
+if __name__ == "__main__":
+    check_automaton()
+    check_subscribers()
+    print("✅ Caption keywords only match whole words.")
@@ -0,0 +1,78 @@
+"""
+Check: a backlog for one throttled domain must not delay other domains.
+Run with: python -m src.test.check_rate_limit
+
+Parked sends book a future slot only in the bucket that limits them, so
+neither the global nor other domains' buckets are drawn down ahead of time.
+"""
+import asyncio
+import time
+from email.message import EmailMessage
+
+from src.services.email_delivery import DeliveryEngine, EmailBackend, SendRateLimiter
+
+
+class RecordingBackend(EmailBackend):
+    """Remembers when each recipient was sent to."""
+    def __init__(self):
+        self.sent_at: dict[str, float] = {}
+
+    async def send(self, message):
+        self.sent_at[message["To"]] = time.monotonic()
+
+
+def make_message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "EventPulse <notifications@eventpulse.local>"
+    message["To"] = recipient
+    message["Subject"] = "New TikTok from @some_creator!"
+    message.set_content("Check it out here -> https://www.tiktok.com/@some_creator/video/7283910293847561234")
+    return message
+
+
+def check_reserve():
+    limiter = SendRateLimiter(global_rate=10, global_burst=100, domain_rate=1, domain_burst=1)
+    delays = [limiter.reserve(f"user{i}@gmail.com")[0] for i in range(50)]
+    assert delays[0] == 0 and abs(delays[-1] - 49) < 0.1, delays
+
+    delay, scope = limiter.reserve("someone@yahoo.com")
+    tokens = limiter.buckets["global"].tokens(None)
+    print(f"yahoo waits {delay:.2f}s behind 50 gmail sends, global tokens {tokens:.1f}")
+    assert delay == 0 and scope is None
+    # Only the first gmail send and the yahoo send took a global token so far
+    assert tokens > 97, tokens
+
+    # A parked send asks again for the scopes it did not hold
+    delay, scope = limiter.reserve("user1@gmail.com", held={"domain"})
+    assert delay == 0 and scope is None
+
+
+async def check_engine():
+    backend = RecordingBackend()
+    limiter = SendRateLimiter(global_rate=1000, global_burst=100, domain_rate=50, domain_burst=1)
+    engine = DeliveryEngine(backend, concurrency=4, limiter=limiter)
+    await engine.start()
+    try:
+        messages = [make_message(f"user{i}@gmail.com") for i in range(100)]
+        other = make_message("someone@yahoo.com")
+
+        start = time.monotonic()
+        gmail = asyncio.create_task(engine.send_many(messages))
+        await asyncio.sleep(0.05)
+        report = await engine.send_many([other])
+        yahoo_delay = backend.sent_at["someone@yahoo.com"] - start
+        await gmail
+        gmail_span = max(backend.sent_at.values()) - start
+    finally:
+        await engine.stop()
+
+    print(f"yahoo sent after {yahoo_delay:.2f}s, 100 gmail sends took {gmail_span:.2f}s")
+    assert report.sent == 1 and yahoo_delay < 0.5, yahoo_delay
+    # 50/s with a burst of 1: the gmail backlog is still spread out
+    assert gmail_span > 1.9, gmail_span
+
+
+if __name__ == "__main__":
+    check_reserve()
+    asyncio.run(check_engine())
+    print("✅ Rate-limited domains do not hold up other mail.")
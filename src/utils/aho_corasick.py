@@ -0,0 +1,84 @@
+"""
+Aho-Corasick multi-pattern matcher.
+Finds every occurrence of any of N patterns in a single pass over the text,
+independent of N (plus the number of matches).
+"""
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class AhoCorasick:
+    """
+    Keyword automaton: a trie of the patterns plus failure links.
+    Matching is exact substring matching; normalize (e.g. casefold)
+    patterns and text the same way before building / searching.
+    """
+    __slots__ = ("patterns", "_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(dict.fromkeys(p for p in patterns if p))
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[str, ...]] = [()]
+
+        for pattern in self.patterns:
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = self._goto[node][char] = len(self._goto)
+                    self._goto.append({})
+                    self._out.append(())
+                node = child
+            self._out[node] += (pattern,)
+
+        # Breadth-first, so a node's failure target is complete before its children
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, str]]:
+        """Yield (end index, pattern) for every occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern in out[node]:
+                yield index, pattern
+
+    def find_all(self, text: str) -> set[str]:
+        """The distinct patterns occurring in text."""
+        return {pattern for _, pattern in self.iter_matches(text)}
+
+    def find_words(self, text: str) -> set[str]:
+        """
+        The distinct patterns occurring in text as whole words: a pattern
+        edge that is a word character must not touch another one in text,
+        so "art" matches "art!" and "#art" but not "party".
+        """
+        found = set()
+        for end, pattern in self.iter_matches(text):
+            start = end - len(pattern) + 1
+            if start > 0 and _is_word(pattern[0]) and _is_word(text[start - 1]):
+                continue
+            if end + 1 < len(text) and _is_word(pattern[-1]) and _is_word(text[end + 1]):
+                continue
+            found.add(pattern)
+        return found
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
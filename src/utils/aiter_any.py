@@ -0,0 +1,13 @@
+from typing import AsyncIterable, AsyncIterator, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+async def aiter_any(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    """Iterate a sync or async iterable with `async for`."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,160 @@
+"""
+Scalable Bloom filter over str keys.
+Answers "definitely absent" or "maybe present" in a fixed number of bit
+probes; bits live in plain bytearrays, so a million keys at a 1% error
+rate take about 1.4 MB (the first stage is sized for half that rate).
+Grows by chaining larger, stricter filters.
+"""
+import hashlib
+import json
+import math
+import os
+import struct
+from typing import Iterable
+
+_MAGIC = b"EPBLOOM1"
+
+
+def _hashes(key: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1, h2 = struct.unpack("<QQ", digest)
+    return h1, h2 | 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` keys at `error_rate`."""
+    __slots__ = ("capacity", "error_rate", "num_bits", "num_hashes", "count", "bits")
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytearray | None = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k probes from one 128-bit digest
+        h1, h2 = _hashes(key)
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, key: str) -> bool:
+        """Set the key's bits; returns False if they were all set already."""
+        bits = self.bits
+        added = False
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """False-positive probability at the current fill level."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class ScalableBloomFilter:
+    """
+    Chain of Bloom filters: when the newest one reaches its capacity, a
+    `growth` times larger one with a `tightening` times lower error rate is
+    added. Stage n targets error_rate * (1 - tightening) * tightening**n,
+    so the compound error rate stays below error_rate however many keys
+    arrive.
+    """
+    def __init__(
+        self,
+        initial_capacity: int,
+        error_rate: float,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: list[BloomFilter] = []
+        self._grow()
+
+    def _grow(self):
+        n = len(self.filters)
+        self.filters.append(BloomFilter(
+            self.initial_capacity * self.growth ** n,
+            self.error_rate * (1 - self.tightening) * self.tightening ** n,
+        ))
+
+    def add(self, key: str):
+        if key in self:
+            return
+        if self.filters[-1].is_full:
+            self._grow()
+        self.filters[-1].add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in bloom for bloom in reversed(self.filters))
+
+    def __len__(self) -> int:
+        """Approximate number of distinct keys added."""
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """Probability that an absent key is reported as maybe present."""
+        miss = 1.0
+        for bloom in self.filters:
+            miss *= 1 - bloom.estimated_error_rate
+        return 1 - miss
+
+    def save(self, path: str, **meta):
+        """Write a snapshot atomically; `meta` is stored alongside and returned by load()."""
+        header = json.dumps({
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "tightening": self.tightening,
+            "counts": [bloom.count for bloom in self.filters],
+            "meta": meta,
+        }).encode("utf-8")
+        tmp = f"{path}.tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC + struct.pack("<I", len(header)) + header)
+            for bloom in self.filters:
+                f.write(bloom.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> tuple["ScalableBloomFilter", dict]:
+        """Read a snapshot written by save(); returns (filter, meta)."""
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a Bloom filter snapshot")
+            (size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(size))
+
+            self = cls(header["initial_capacity"], header["error_rate"], header["growth"], header["tightening"])
+            self.filters = []
+            for count in header["counts"]:
+                self._grow()
+                bloom = self.filters[-1]
+                bloom.bits = bytearray(f.read(len(bloom.bits)))
+                if len(bloom.bits) != (bloom.num_bits + 7) // 8:
+                    raise ValueError(f"{path} is truncated")
+                bloom.count = count
+        return self, header["meta"]
@@ -0,0 +1,77 @@
+"""
+Keyed token buckets with lazy refill.
+Each key costs a single float: the time at which its bucket will be full
+again (the GCRA "theoretical arrival time"). Tokens are never topped up
+by a timer; the balance is derived from that timestamp on access, and a
+key whose bucket has refilled completely is simply dropped.
+"""
+import time
+from typing import Callable, Hashable
+
+
+class TokenBuckets:
+    """
+    One token bucket per key, all sharing `rate` (tokens/second) and
+    `burst` (bucket capacity). A rate of 0 or less disables limiting.
+    """
+    __slots__ = ("rate", "burst", "_interval", "_capacity", "_full_at", "_clock", "_ops")
+
+    # Full buckets are swept out every this many acquisitions
+    SWEEP_EVERY = 10_000
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._capacity = self.burst * self._interval
+        self._full_at: dict[Hashable, float] = {}
+        self._clock = clock
+        self._ops = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def __len__(self) -> int:
+        return len(self._full_at)
+
+    def wait_time(self, key: Hashable, now: float | None = None) -> float:
+        """Seconds until a token is available for key (0 = available now)."""
+        if not self.enabled:
+            return 0.0
+        now = self._clock() if now is None else now
+        full_at = max(self._full_at.get(key, now), now)
+        return max(full_at + self._interval - self._capacity - now, 0.0)
+
+    def consume(self, key: Hashable, now: float | None = None):
+        """Take one token; callers check wait_time() first."""
+        if not self.enabled:
+            return
+        now = self._clock() if now is None else now
+        self._full_at[key] = max(self._full_at.get(key, now), now) + self._interval
+        self._ops += 1
+        if self._ops >= self.SWEEP_EVERY:
+            self._ops = 0
+            # Not `now`: that may be a future slot being booked
+            self.sweep()
+
+    def tokens(self, key: Hashable, now: float | None = None) -> float:
+        """Current (fractional) token balance of key; negative once slots are booked ahead."""
+        if not self.enabled:
+            return float(self.burst)
+        now = self._clock() if now is None else now
+        debt = max(self._full_at.get(key, now) - now, 0.0)
+        return (self._capacity - debt) / self._interval
+
+    def sweep(self, now: float | None = None):
+        """Forget keys whose bucket has refilled completely."""
+        now = self._clock() if now is None else now
+        self._full_at = {key: full_at for key, full_at in self._full_at.items() if full_at > now}
+
+    def throttled(self, now: float | None = None) -> int:
+        """Number of keys currently out of tokens."""
+        if not self.enabled:
+            return 0
+        now = self._clock() if now is None else now
+        limit = now + self._capacity - self._interval
+        return sum(1 for full_at in self._full_at.values() if full_at > limit)
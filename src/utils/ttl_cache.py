@@ -0,0 +1,76 @@
+"""
+Bounded in-process LRU cache with per-entry TTL.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU cache holding at most maxsize entries, each valid for ttl seconds.
+    Expired entries are dropped lazily when they are read or evicted.
+
+    With a weigher, maxsize bounds the summed weight of the values instead
+    of their number (e.g. list lengths); a single value heavier than
+    maxsize is not kept at all.
+    """
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        weigher: Callable[[V], int] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._weigher = weigher
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _weigh(self, value: V) -> int:
+        return self._weigher(value) if self._weigher else 1
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: K, default=None):
+        """Return the cached value (refreshing its LRU position) or default."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= self._clock():
+            self.pop(key)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V):
+        """Insert or refresh an entry, evicting the least recently used ones."""
+        self.pop(key)
+        self._data[key] = (self._clock() + self.ttl, value)
+        self.weight += self._weigh(value)
+        while self.weight > self.maxsize:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.weight -= self._weigh(evicted)
+
+    def pop(self, key: K, default=None):
+        item = self._data.pop(key, None)
+        if item is None:
+            return default
+        self.weight -= self._weigh(item[1])
+        return item[1]
+
+    def clear(self):
+        self._data.clear()
+        self.weight = 0
@@ -0,0 +1,110 @@
+# src/worker/dlq_replay.py
+"""
+DLQ Replay - re-publishes dead-lettered events in bulk.
+
+Usage:
+    python -m src.worker.dlq_replay [--topic video.found.bulk ...] [--limit N] [--dry-run]
+
+Without --topic, the DLQs of every lane in WORKER_LANES are replayed.
+Reads <topic>.dlq up to its current end, strips the retry/error headers and
+publishes each message back to the topic it originally failed on. Progress is
+committed under its own consumer group, so a replay can be resumed.
+"""
+import argparse
+import asyncio
+from collections import Counter
+
+from src.core.config import settings
+from src.core.kafka import EventConsumer, EventProducer
+from src.core.retry import (
+    ERROR_TYPE_HEADER, ORIGINAL_TOPIC_HEADER, dlq_topic, header_value, strip_routing_headers,
+)
+from src.services.lanes import lane_topic, parse_lanes
+
+
+async def replay_dlq(base_topic: str, limit: int | None = None, dry_run: bool = False) -> int:
+    """
+    Replay the DLQ of base_topic.
+
+    Returns:
+        Number of messages replayed (or that would be, with dry_run).
+    """
+    consumer = EventConsumer(
+        topic=dlq_topic(base_topic), group_id=f"{base_topic}.dlq-replay", enable_auto_commit=False
+    )
+    producer = EventProducer()
+    await consumer.start_consumer()
+    if not dry_run:
+        await producer.start_producer()
+
+    # Snapshot the end of the DLQ so messages dead-lettered during the replay are left alone
+    assignment = consumer.consumer.assignment()
+    end_offsets = await consumer.consumer.end_offsets(list(assignment))
+    remaining = {tp for tp in assignment if await consumer.consumer.position(tp) < end_offsets[tp]}
+
+    replayed = 0
+    errors = Counter()
+    deliveries = []
+    next_offsets = {}
+    try:
+        while remaining and (limit is None or replayed < limit):
+            batches = await consumer.consumer.getmany(*remaining, timeout_ms=1000)
+            for tp, messages in batches.items():
+                for msg in messages:
+                    if msg.offset >= end_offsets[tp] or (limit is not None and replayed >= limit):
+                        remaining.discard(tp)
+                        break
+                    errors[header_value(msg, ERROR_TYPE_HEADER) or "unknown"] += 1
+                    if not dry_run:
+                        target = header_value(msg, ORIGINAL_TOPIC_HEADER) or base_topic
+                        deliveries.append(await producer.send_raw(
+                            target, msg.value, key=msg.key, headers=strip_routing_headers(msg.headers)
+                        ))
+                    replayed += 1
+                    next_offsets[tp] = msg.offset + 1
+                    if msg.offset + 1 >= end_offsets[tp]:
+                        remaining.discard(tp)
+
+        if not dry_run and next_offsets:
+            # Only move the replay group forward once everything is re-published
+            await asyncio.gather(*deliveries)
+            await consumer.consumer.commit(next_offsets)
+    finally:
+        await consumer.stop_consumer()
+        await producer.stop_producer()
+
+    action = "Would replay" if dry_run else "Replayed"
+    print(f"♻️ {action} {replayed} events from '{dlq_topic(base_topic)}'")
+    for error_type, count in errors.most_common():
+        print(f"  {error_type}: {count}")
+    return replayed
+
+
+async def replay_dlqs(base_topics: list[str], limit: int | None = None, dry_run: bool = False) -> int:
+    """Replay the DLQs of several base topics in turn; limit applies to the total."""
+    replayed = 0
+    for base_topic in base_topics:
+        if limit is not None and replayed >= limit:
+            break
+        replayed += await replay_dlq(
+            base_topic, limit=None if limit is None else limit - replayed, dry_run=dry_run
+        )
+    return replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay dead-lettered events")
+    parser.add_argument(
+        "--topic", action="append", dest="topics",
+        help="Base topic whose DLQ to replay (repeatable; default: every lane in WORKER_LANES)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most N events")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be replayed")
+    args = parser.parse_args()
+
+    topics = args.topics or [lane_topic(lane) for lane in parse_lanes(settings.WORKER_LANES)]
+    asyncio.run(replay_dlqs(topics, limit=args.limit, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# src/worker/outbox_relay.py
+"""
+Outbox Relay - drains the event_outbox table into Kafka.
+Several relays can run side by side: each claims its batch with
+SELECT ... FOR UPDATE SKIP LOCKED, so no row is published by two relays at once.
+"""
+import asyncio
+
+from src.core.config import settings
+from src.core.db import AsyncSessionLocal
+from src.core.kafka import EventProducer
+from src.repositories.outbox import EventOutboxRepository
+
+
+async def relay_batch(producer: EventProducer, batch_size: int) -> int:
+    """
+    Publish one batch of pending events and delete the delivered rows.
+    Rows that fail to publish stay in the outbox and are retried on the next pass.
+
+    Returns:
+        Number of events published.
+    """
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            repo = EventOutboxRepository(session)
+            entries = await repo.claim_batch(batch_size)
+            if not entries:
+                return 0
+
+            deliveries = [
+                await producer.send_raw(
+                    entry.topic,
+                    entry.payload,
+                    key=entry.key.encode("utf-8") if entry.key else None,
+                    headers=[(k, v.encode("utf-8")) for k, v in (entry.headers or {}).items()],
+                    label=str(entry.event_id),
+                )
+                for entry in entries
+            ]
+            results = await asyncio.gather(*deliveries, return_exceptions=True)
+
+            published = [
+                entry.id for entry, result in zip(entries, results)
+                if not isinstance(result, Exception)
+            ]
+            await repo.delete_many(published)
+
+    if len(published) < len(entries):
+        print(f"⚠️ Outbox relay: {len(entries) - len(published)} events will be retried")
+    return len(published)
+
+
+async def run_relay(
+    batch_size: int = settings.OUTBOX_RELAY_BATCH_SIZE,
+    poll_interval: float = settings.OUTBOX_RELAY_POLL_INTERVAL_SECONDS,
+):
+    producer = EventProducer()
+    await producer.start_producer()
+
+    print("🚀 Outbox Relay Started. Draining event_outbox...")
+
+    try:
+        while True:
+            try:
+                published = await relay_batch(producer, batch_size)
+            except Exception as e:
+                print(f"❌ Outbox relay error: {e}")
+                published = 0
+
+            # A full batch means there is probably more waiting
+            if published < batch_size:
+                await asyncio.sleep(poll_interval)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("🛑 Stopping Outbox Relay...")
+    finally:
+        await producer.stop_producer()
+
+if __name__ == "__main__":
+    asyncio.run(run_relay())
@@ -0,0 +1,162 @@
+# src/worker/supervisor.py
+"""
+Notifier Supervisor - runs N notifier worker processes on one host.
+
+Usage:
+    python -m src.worker.supervisor [--processes N] [--mode stream|concurrent|batch] [--lanes fast,bulk]
+
+Every child joins the notifications_service.<lane> consumer group of each of
+its lanes, so Kafka spreads the video.found.<lane> partitions across them and
+each gets its own CPU core. Run separate supervisors with --lanes fast and
+--lanes bulk to give each lane dedicated processes.
+Crashed children are restarted with exponential backoff; SIGTERM/SIGINT are
+passed on so children drain in-flight events and commit before exiting.
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import signal
+import time
+from dataclasses import dataclass
+
+from src.core.config import settings
+
+# A child that stayed up this long is considered healthy again
+STABLE_AFTER_SECONDS = 60.0
+
+
+def _child_main(index: int, counter, mode: str, lanes: str):
+    """Entry point of one worker process."""
+    from src.worker.worker import run_worker
+
+    print(f"👷 Worker #{index} started (pid {os.getpid()})")
+    asyncio.run(run_worker(mode=mode, processed_counter=counter, lanes=lanes))
+
+
+@dataclass
+class _Slot:
+    """One supervised worker position and its restart bookkeeping."""
+    index: int
+    counter: object
+    process: mp.Process | None = None
+    started_at: float = 0.0
+    failures: int = 0
+    restart_at: float = 0.0
+    last_count: int = 0
+    restarts: int = 0
+
+
+class WorkerSupervisor:
+    """
+    Forks and babysits the notifier worker processes.
+    """
+    def __init__(self, processes: int, mode: str = settings.WORKER_MODE, lanes: str = settings.WORKER_LANES):
+        self.ctx = mp.get_context("spawn")
+        self.mode = mode
+        self.lanes = lanes
+        self.slots = [_Slot(index=i, counter=self.ctx.Value("Q", 0)) for i in range(processes)]
+        self.stopping = False
+
+    def _spawn(self, slot: _Slot):
+        slot.process = self.ctx.Process(
+            target=_child_main,
+            args=(slot.index, slot.counter, self.mode, self.lanes),
+            name=f"notifier-{slot.index}",
+        )
+        slot.process.start()
+        slot.started_at = time.monotonic()
+
+    def _check(self, slot: _Slot, now: float):
+        """Restart a dead child once its backoff has elapsed."""
+        if slot.process is not None and slot.process.is_alive():
+            if slot.failures and now - slot.started_at > STABLE_AFTER_SECONDS:
+                slot.failures = 0
+            return
+
+        if slot.process is not None:
+            exitcode = slot.process.exitcode
+            slot.process = None
+            slot.failures += 1
+            backoff = min(
+                settings.WORKER_RESTART_BACKOFF_SECONDS * 2 ** (slot.failures - 1),
+                settings.WORKER_RESTART_BACKOFF_MAX_SECONDS,
+            )
+            slot.restart_at = now + backoff
+            print(f"💥 Worker #{slot.index} exited with code {exitcode}; restarting in {backoff:.1f}s")
+
+        if now >= slot.restart_at:
+            slot.restarts += 1
+            self._spawn(slot)
+
+    def _report(self, elapsed: float):
+        """Print per-process and total throughput since the last report."""
+        total = 0.0
+        parts = []
+        for slot in self.slots:
+            count = slot.counter.value
+            rate = (count - slot.last_count) / elapsed
+            slot.last_count = count
+            total += rate
+            pid = slot.process.pid if slot.process is not None else "-"
+            parts.append(f"#{slot.index}(pid {pid}): {rate:.1f}/s")
+        print(f"📈 Throughput {total:.1f} events/s | " + " ".join(parts))
+
+    def _request_stop(self, signum, _frame):
+        if self.stopping:
+            return
+        self.stopping = True
+        print(f"🛑 Supervisor received {signal.Signals(signum).name}, draining workers...")
+        for slot in self.slots:
+            if slot.process is not None and slot.process.is_alive():
+                os.kill(slot.process.pid, signal.SIGTERM)
+
+    def _shutdown(self):
+        deadline = time.monotonic() + settings.WORKER_SHUTDOWN_TIMEOUT_SECONDS
+        for slot in self.slots:
+            if slot.process is not None:
+                slot.process.join(max(deadline - time.monotonic(), 0))
+                if slot.process.is_alive():
+                    print(f"⚠️ Worker #{slot.index} did not drain in time, killing it")
+                    slot.process.kill()
+                    slot.process.join()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        for slot in self.slots:
+            self._spawn(slot)
+        print(f"🚀 Supervisor started {len(self.slots)} notifier workers (mode={self.mode}, lanes={self.lanes})")
+
+        last_report = time.monotonic()
+        try:
+            while not self.stopping:
+                time.sleep(0.5)
+                now = time.monotonic()
+                for slot in self.slots:
+                    if not self.stopping:
+                        self._check(slot, now)
+                if now - last_report >= settings.WORKER_REPORT_INTERVAL_SECONDS:
+                    self._report(now - last_report)
+                    last_report = now
+        finally:
+            self._shutdown()
+            print("👋 Supervisor stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several notifier worker processes")
+    parser.add_argument(
+        "--processes", type=int, default=settings.WORKER_PROCESSES or os.cpu_count(),
+        help="Number of worker processes (default: WORKER_PROCESSES or CPU count)",
+    )
+    parser.add_argument("--mode", default=settings.WORKER_MODE, choices=("stream", "concurrent", "batch"))
+    parser.add_argument("--lanes", default=settings.WORKER_LANES, help="Priority lanes to consume, e.g. fast,bulk")
+    args = parser.parse_args()
+
+    WorkerSupervisor(args.processes, mode=args.mode, lanes=args.lanes).run()
+
+
+if __name__ == "__main__":
+    main()
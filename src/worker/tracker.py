@@ -0,0 +1,227 @@
+# src/worker/tracker.py
+"""
+Tracker Scheduler - polls monitored accounts for new videos.
+
+Usage:
+    python -m src.worker.tracker
+
+Any number of replicas can run side by side without a coordinator: each
+claims batches of due accounts with a lease (UPDATE ... WHERE id IN
+(SELECT ... FOR UPDATE SKIP LOCKED LIMIT n)), hands them to a bounded pool
+of fetcher tasks, and each poll writes the account's adaptive next_poll_at
+back and releases the lease. A replica that dies simply lets its leases
+expire, after which the others pick those accounts up.
+"""
+import asyncio
+import heapq
+import os
+import signal
+import socket
+import time
+import uuid
+
+from src.core.config import settings
+from src.core.db import AsyncSessionLocal
+from src.core.metrics import metrics
+from src.repositories.account import MonitoredAccountRepository
+from src.repositories.outbox import EventOutboxRepository
+from src.repositories.video import ProcessedVideoRepository
+from src.services.tracker_service import TrackerService
+from src.services.video_fetcher import VideoFetcher, get_video_fetcher
+from src.services.video_filter import ProcessedVideoFilter
+
+
+class TrackerScheduler:
+    """
+    Polls due accounts, at most `concurrency` at once (by default as many
+    as the fetcher serves without queueing, so a leased account never waits
+    for a browser session while its lease runs down).
+
+    The DB decides which account is due and who polls it; the min-heap
+    holds this replica's wake-up times (the next_poll_at of accounts it
+    polled and the earliest due time in the DB), so the dispatcher sleeps
+    until the next account can be due instead of polling the table. It
+    still checks at least every idle_check seconds for accounts added or
+    rescheduled elsewhere.
+    """
+    def __init__(
+        self,
+        fetcher: VideoFetcher,
+        concurrency: int = settings.TRACKER_CONCURRENCY,
+        lease_seconds: float = settings.TRACKER_LEASE_SECONDS,
+        idle_check: float = settings.TRACKER_IDLE_CHECK_SECONDS,
+        owner: str | None = None,
+        video_filter: ProcessedVideoFilter | None = None,
+        sessionmaker=AsyncSessionLocal,
+    ):
+        self.fetcher = fetcher
+        self.sessionmaker = sessionmaker
+        self.video_filter = video_filter
+        self.concurrency = concurrency or fetcher.concurrency
+        self.lease_seconds = lease_seconds
+        self.idle_check = idle_check
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeups: list[float] = []
+        self._in_flight: set[uuid.UUID] = set()
+        self._queue: asyncio.Queue[tuple[uuid.UUID, float]] = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self.running = True
+
+        self.polls = metrics.counter("tracker.polls")
+        self.errors = metrics.counter("tracker.errors")
+        self.new_videos = metrics.counter("tracker.new_videos")
+        self.leased = metrics.counter("tracker.leased")
+        self.poll_ms = metrics.summary("tracker.poll_ms")
+        # How late polls start compared to next_poll_at
+        self.lag_ms = metrics.summary("tracker.lag_ms")
+        metrics.gauge("tracker.in_flight", lambda: len(self._in_flight))
+
+    def _wake_at(self, timestamp: float):
+        heapq.heappush(self._wakeups, timestamp)
+        if self._wakeups[0] == timestamp:
+            self._wakeup.set()
+
+    async def run(self):
+        """Claim and dispatch due accounts until stopped."""
+        print(f"🗓️ Tracker replica {self.owner} polling with {self.concurrency} fetchers")
+        fetchers = [asyncio.create_task(self._fetcher()) for _ in range(self.concurrency)]
+        try:
+            while self.running:
+                free = self.concurrency - len(self._in_flight)
+                claimed = await self._claim(free) if free else 0
+                if free and claimed == free:
+                    # Probably more due right now
+                    continue
+
+                now = time.time()
+                while self._wakeups and self._wakeups[0] <= now:
+                    heapq.heappop(self._wakeups)
+                timeout = self.idle_check
+                if self._wakeups:
+                    timeout = min(timeout, self._wakeups[0] - now)
+
+                # Fetchers set the event when a slot frees up
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    pass
+        finally:
+            # Let polls in progress finish and persist their schedule
+            await self._queue.join()
+            for task in fetchers:
+                task.cancel()
+            await asyncio.gather(*fetchers, return_exceptions=True)
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
+
+    async def _claim(self, limit: int) -> int:
+        """Lease up to limit due accounts and queue them; returns how many."""
+        try:
+            async with self.sessionmaker() as session:
+                repo = MonitoredAccountRepository(session)
+                accounts = await repo.lease_due_accounts(self.owner, limit, self.lease_seconds)
+                next_due = await repo.next_due_at() if len(accounts) < limit else None
+                await repo.commit(session)
+        except Exception as e:
+            print(f"❌ Tracker could not claim accounts: {e}")
+            return 0
+
+        now = time.time()
+        for account in accounts:
+            due_at = account.next_poll_at.timestamp() if account.next_poll_at else now
+            self.lag_ms.observe(max(now - due_at, 0) * 1000)
+            self._in_flight.add(account.id)
+            self._queue.put_nowait((account.id, now + self.lease_seconds))
+        if next_due is not None:
+            self._wake_at(next_due.timestamp())
+        self.leased.inc(len(accounts))
+        return len(accounts)
+
+    async def _fetcher(self):
+        while True:
+            account_id, lease_expires = await self._queue.get()
+            try:
+                # Past the lease another replica may poll the account too
+                due_at = await asyncio.wait_for(self._poll(account_id), lease_expires - time.time())
+            except Exception as e:
+                # The lease is kept: the account is retried once it expires
+                print(f"❌ Polling account {account_id} failed: {e!r}")
+                self.errors.inc()
+                due_at = None
+            finally:
+                self._in_flight.discard(account_id)
+                self._queue.task_done()
+            if due_at is not None:
+                self._wake_at(due_at)
+            self._wakeup.set()
+
+    async def _poll(self, account_id: uuid.UUID) -> float | None:
+        """Poll one leased account; returns when it is due next (None if it is gone)."""
+        start = time.perf_counter()
+        async with self.sessionmaker() as session:
+            account_repo = MonitoredAccountRepository(session)
+            account = await account_repo.get(session, account_id)
+            if account is None or not account.is_active:
+                return None
+
+            service = TrackerService(
+                account_repo,
+                ProcessedVideoRepository(session),
+                EventOutboxRepository(session),
+                fetcher=self.fetcher,
+                video_filter=self.video_filter,
+            )
+            published = await service.process_account(account)
+
+        self.polls.inc()
+        self.new_videos.inc(len(published))
+        self.poll_ms.observe((time.perf_counter() - start) * 1000)
+        return account.next_poll_at.timestamp()
+
+
+async def run_tracker():
+    # Warm browser sessions (or the fake backend) shared by all polls
+    fetcher = get_video_fetcher()
+    await fetcher.start()
+
+    # Spares re-scans the DB read for videos this process never recorded
+    video_filter = ProcessedVideoFilter()
+    await video_filter.load()
+    scheduler = TrackerScheduler(fetcher, video_filter=video_filter)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, scheduler.stop)
+
+    async def report_metrics():
+        while True:
+            await asyncio.sleep(settings.WORKER_REPORT_INTERVAL_SECONDS)
+            print(f"📊 Metrics: {metrics.snapshot()}")
+
+    async def snapshot_filter():
+        while True:
+            await asyncio.sleep(settings.TRACKER_BLOOM_SNAPSHOT_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(video_filter.save)
+            except Exception as e:
+                print(f"⚠️ Video filter snapshot failed: {e}")
+
+    reporter = asyncio.create_task(report_metrics())
+    snapshotter = asyncio.create_task(snapshot_filter())
+    print("🚀 Tracker Started. Polling monitored accounts...")
+
+    try:
+        await scheduler.run()
+    finally:
+        print("🛑 Stopping Tracker...")
+        reporter.cancel()
+        snapshotter.cancel()
+        video_filter.save()
+        await fetcher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tracker())
@@ -1,44 +1,240 @@
 # src/worker.py
 import asyncio
+import signal
+from dataclasses import dataclass
 
+from src.core.config import settings
 from src.core.db import AsyncSessionLocal
-from src.core.kafka import EventConsumer
+from src.core.kafka import BatchPartiallyHandled, EventConsumer, EventProducer
+from src.core.retry import DelayedRetryConsumer, RetryRouter
+from src.core.metrics import metrics
+from src.repositories.notification_delivery import NotificationDeliveryRepository
+from src.repositories.pending_notification import PendingNotificationRepository
+from src.repositories.processed_event import ProcessedEventRepository
 from src.repositories.subscription import SubscriptionRepository
+from src.services.idempotency import IdempotencyGuard
+from src.services.digest import DigestScheduler
+from src.services.email_delivery import DeliveryEngine, SendRateLimiter, get_email_backend
+from src.services.lanes import lane_topic, parse_lane_concurrency, parse_lanes
 from src.services.notifier_service import NotifierService
-from src.schemas.events import VideoFoundEvent
+from src.services.subscriber_cache import SubscriberCache
+from src.schemas.events import SubscriptionChangedEvent, VideoFoundEvent
 
-async def run_worker():
-    # 1. Initialize Infrastructure
-    # We use a dedicated group_id so we can scale this worker independently
-    consumer = EventConsumer(topic="video.found", group_id="notifications_service")
+@dataclass
+class LanePool:
+    """The consumers of one priority lane: its main topic plus its retry tiers."""
+    lane: str
+    consumer: EventConsumer
+    retry_consumers: list[DelayedRetryConsumer]
+    concurrency: int
+
+    @property
+    def consumers(self) -> list[EventConsumer]:
+        return [self.consumer, *self.retry_consumers]
+
+
+async def start_lane_pool(producer: EventProducer, lane: str, mode: str, concurrency: int) -> LanePool:
+    topic = lane_topic(lane)
+    # Failed events are re-published to the lane's retry tiers / DLQ
+    router = RetryRouter(producer, base_topic=topic)
+
+    # A group per lane, so a rebalance in one lane never stalls the other.
+    # Batch and concurrent modes commit offsets themselves
+    consumer = EventConsumer(
+        topic=topic,
+        group_id=f"notifications_service.{lane}",
+        enable_auto_commit=(mode == "stream"),
+    )
+    consumer.failure_handler = router
     await consumer.start_consumer()
 
-    print("🚀 Notifier Worker Started (Clean Arch). Waiting for events...")
+    # One delay-aware consumer per retry tier, in their own group so a
+    # paused tier never triggers a rebalance of the main consumers
+    retry_consumers = []
+    for retry_topic in router.retry_topics:
+        retry_consumer = DelayedRetryConsumer(
+            topic=retry_topic, group_id=f"notifications_service.{lane}.retry", enable_auto_commit=False
+        )
+        retry_consumer.failure_handler = router
+        await retry_consumer.start_consumer()
+        retry_consumers.append(retry_consumer)
+
+    return LanePool(lane, consumer, retry_consumers, concurrency)
+
+
+async def run_worker(
+    mode: str = settings.WORKER_MODE,
+    concurrency: int = settings.WORKER_CONCURRENCY,
+    processed_counter=None,
+    lanes: str = settings.WORKER_LANES,
+):
+    """
+    Run the notifier consumer loops until SIGTERM/SIGINT.
+
+    Args:
+        mode: "stream", "concurrent" or "batch" (see WORKER_MODE)
+        concurrency: Events per partition in concurrent mode, for lanes
+            without an entry in WORKER_LANE_CONCURRENCY
+        processed_counter: Optional shared multiprocessing.Value incremented
+            per handled event (used by the supervisor for throughput reports)
+        lanes: Comma-separated priority lanes to consume, e.g. "fast,bulk"
+    """
+    # 1. Initialize Infrastructure
+    producer = EventProducer()
+    await producer.start_producer()
+
+    # One consumer pool per priority lane
+    lane_concurrency = parse_lane_concurrency(settings.WORKER_LANE_CONCURRENCY)
+    pools = [
+        await start_lane_pool(producer, lane, mode, lane_concurrency.get(lane, concurrency))
+        for lane in parse_lanes(lanes)
+    ]
+
+    # Drops redelivered events (rebalance / restart) before they are re-sent
+    guard = IdempotencyGuard()
+
+    # Subscriber lists shared by all events of this process. Every process
+    # must see every change, so the invalidation consumer has no group and
+    # only reads changes made from now on.
+    subscriber_cache = SubscriberCache()
+    invalidation_consumer = EventConsumer(
+        topic="subscription.changed",
+        group_id=None,
+        enable_auto_commit=False,
+        auto_offset_reset="latest",
+    )
+    await invalidation_consumer.start_consumer()
+
+    # Emails of all events go through one bounded, pooled sender
+    delivery = DeliveryEngine(get_email_backend(), limiter=SendRateLimiter())
+    await delivery.start()
+
+    # Optional per-user coalescing window in front of delivery
+    digest = None
+    if settings.DIGEST_WINDOW_SECONDS > 0:
+        digest = DigestScheduler(delivery)
+        await digest.start()
+
+    lane_info = ", ".join(f"{pool.lane}={pool.concurrency}" for pool in pools)
+    print(f"🚀 Notifier Worker Started (Clean Arch, mode={mode}, lanes: {lane_info}). Waiting for events...")
 
-    async def event_processor(payload: dict):
+    def request_stop():
+        """Stop polling; the loops then drain in-flight events and commit."""
+        print("🛑 Stopping Worker, draining in-flight events...")
+        for c in (*(c for pool in pools for c in pool.consumers), invalidation_consumer):
+            c.running = False
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, request_stop)
+
+    def count_processed(n: int = 1):
+        if processed_counter is not None:
+            with processed_counter.get_lock():
+                processed_counter.value += n
+
+    async def event_processor(event: VideoFoundEvent):
         """
         Callback wrapper to ensure every event gets a FRESH DB session.
         This prevents stale data issues.
+        Errors propagate so the consumer can route the event to a retry tier.
         """
+        if guard.seen_recently(event):
+            return
+
         async with AsyncSessionLocal() as session:
             # Dependency Injection
             repo = SubscriptionRepository(session)
-            service = NotifierService(repo)
-            
-            # Convert Dict -> Pydantic Schema
+            service = NotifierService(
+                repo, subscriber_cache, delivery,
+                progress_repo=NotificationDeliveryRepository(session),
+                digest=digest,
+                pending_repo=PendingNotificationRepository(session),
+            )
+            events_repo = ProcessedEventRepository(session)
+
+            if not await guard.claim(events_repo, [event]):
+                return
             try:
-                event = VideoFoundEvent(**payload)
                 await service.handle_event(event)
+                await guard.mark_processed(events_repo, [event])
+            except Exception:
+                await guard.release(events_repo, [event], handled=service.handled)
+                raise
+            if digest is not None:
+                digest.schedule(service.digest_schedule)
+        count_processed()
+
+    async def batch_processor(events: list[VideoFoundEvent]):
+        """
+        Batch callback: one DB session for the whole batch
+        instead of one per event.
+        """
+        async with AsyncSessionLocal() as session:
+            repo = SubscriptionRepository(session)
+            service = NotifierService(
+                repo, subscriber_cache, delivery,
+                progress_repo=NotificationDeliveryRepository(session),
+                digest=digest,
+                pending_repo=PendingNotificationRepository(session),
+            )
+            events_repo = ProcessedEventRepository(session)
+
+            events = await guard.claim(events_repo, events)
+            if not events:
+                return
+            try:
+                await service.handle_events(events)
+                await guard.mark_processed(events_repo, events)
             except Exception as e:
-                print(f"❌ Error processing event: {e}")
+                # Only the events whose emails did not go out are replayed
+                await guard.release(events_repo, events, handled=service.handled)
+                if service.handled:
+                    raise BatchPartiallyHandled(event.event_id for event in service.handled) from e
+                raise
+            if digest is not None:
+                digest.schedule(service.digest_schedule)
+        count_processed(len(events))
+
+    async def invalidation_processor(event: SubscriptionChangedEvent):
+        subscriber_cache.invalidate(event.payload.account_username)
+
+    # 2. Start the Loops
+    def lane_loops(pool: LanePool):
+        if mode == "batch":
+            yield pool.consumer.consume_batches(batch_processor)
+        elif mode == "concurrent":
+            # Events of one account stay ordered; offsets commit in order
+            yield pool.consumer.consume_concurrent(event_processor, workers_per_partition=pool.concurrency)
+        else:
+            yield pool.consumer.consume_events(event_processor)
+        for retry_consumer in pool.retry_consumers:
+            yield retry_consumer.consume_delayed(event_processor)
+
+    async def report_metrics():
+        while True:
+            await asyncio.sleep(settings.WORKER_REPORT_INTERVAL_SECONDS)
+            print(f"📊 Metrics: {metrics.snapshot()}")
+
+    reporter = asyncio.create_task(report_metrics())
 
     try:
-        # 2. Start the Loop
-        await consumer.consume_events(event_processor)
+        await asyncio.gather(
+            *(coro for pool in pools for coro in lane_loops(pool)),
+            invalidation_consumer.consume_events(invalidation_processor),
+        )
     except KeyboardInterrupt:
         print("🛑 Stopping Worker...")
     finally:
-        await consumer.stop_consumer()
+        reporter.cancel()
+        for pool in pools:
+            for c in pool.consumers:
+                await c.stop_consumer()
+        await invalidation_consumer.stop_consumer()
+        if digest is not None:
+            await digest.stop()
+        await delivery.stop()
+        await producer.stop_producer()
 
 if __name__ == "__main__":
-    asyncio.run(run_worker())
\ No newline at end of file
+    asyncio.run(run_worker())